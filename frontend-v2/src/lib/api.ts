@@ -548,14 +548,32 @@ class ApiClient {
 
   /**
    * Get all subscriptions in a mosaic
+   *
+   * The endpoint is keyset-paginated (at most 500 per page), so this follows
+   * next_cursor until every page has been fetched.
    */
   async listSubscriptions(mosaicId: number): Promise<SubscriptionOut[]> {
-    return request<SubscriptionOut[]>(`/api/mosaics/${mosaicId}/subscriptions`, {
-      autoToast: {
-        success: false,
-        error: true
-      }
-    })
+    const subscriptions: SubscriptionOut[] = []
+    let cursor: string | null | undefined = undefined
+
+    do {
+      const queryParams = new URLSearchParams({ limit: '500' })
+      if (cursor) queryParams.append('cursor', cursor)
+
+      const page: PaginatedData<SubscriptionOut> = await request<PaginatedData<SubscriptionOut>>(
+        `/api/mosaics/${mosaicId}/subscriptions?${queryParams.toString()}`,
+        {
+          autoToast: {
+            success: false,
+            error: true
+          }
+        }
+      )
+      subscriptions.push(...page.items)
+      cursor = page.next_cursor
+    } while (cursor)
+
+    return subscriptions
   }
 
   /**
@@ -836,6 +854,8 @@ class ApiClient {
     if (options?.remoteSessionId) queryParams.append('remote_session_id', options.remoteSessionId)
     if (options?.page) queryParams.append('page', options.page.toString())
     if (options?.pageSize) queryParams.append('page_size', options.pageSize.toString())
+    // Total is opt-in on this endpoint; the list page shows page counts
+    queryParams.append('with_total', 'true')
 
     const queryString = queryParams.toString()
     const url = `/api/mosaics/${mosaicId}/session-routings${queryString ? `?${queryString}` : ''}`
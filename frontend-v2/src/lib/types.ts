@@ -32,6 +32,7 @@ export interface PaginatedData<T> {
   page: number
   page_size: number
   total_pages: number
+  next_cursor?: string | null
 }
 
 // ==================== Constants ====================
@@ -13,6 +13,7 @@ from .session_routing import router as session_routing_router
 from .message import router as message_router
 from .image import router as image_router
 from .programmable import router as programmable_router
+from .health import router as health_router
 
 __all__ = [
     "auth_router",
@@ -25,5 +26,6 @@ __all__ = [
     "session_routing_router",
     "message_router",
     "image_router",
-    "programmable_router"
+    "programmable_router",
+    "health_router"
 ]
@@ -0,0 +1,77 @@
+"""Health check API endpoints"""
+
+import logging
+
+import orjson
+from fastapi import APIRouter, Request, Response
+
+from ..schema.response import SuccessResponse
+
+logger = logging.getLogger(__name__)
+
+# Router configuration
+router = APIRouter(prefix="/health", tags=["Health"])
+
+# Probes are polled constantly, so the liveness body is encoded once
+_LIVE_BODY = orjson.dumps(SuccessResponse(data={"status": "alive"}).model_dump())
+
+
+# ==================== API Endpoints ====================
+
+@router.get("/live", response_model=SuccessResponse[dict])
+async def liveness():
+    """Report that the process is serving requests
+
+    Business logic:
+    1. Return the pre-encoded success body (no dependency is checked)
+    """
+    # 1. Build response
+    return Response(content=_LIVE_BODY, media_type="application/json")
+
+
+@router.get("/ready", response_model=SuccessResponse[dict])
+async def readiness(request: Request):
+    """Report whether the application can serve all traffic
+
+    Business logic:
+    1. Check that lifespan startup has finished (app.state.ready)
+    2. Check that the code-server instance, started in the background,
+       is running
+    3. Return success if both hold, otherwise HTTP 503 with the
+       component statuses
+
+    Note:
+    - Unlike business errors, "not ready" uses a real 503 status so load
+      balancers and orchestrators can gate traffic on it
+    """
+    # 1. Lifespan startup state
+    app_ready = getattr(request.app.state, "ready", False)
+
+    # 2. Code-server state
+    code_server_status = request.app.state.code_server_manager.status
+
+    data = {
+        "status": "ready" if app_ready and code_server_status == "running" else "not_ready",
+        "app": "ready" if app_ready else "starting",
+        "code_server": code_server_status,
+    }
+
+    # 3. Build response
+    # (bodies keep the SuccessResponse / ErrorResponse shapes but are encoded
+    # directly, so no model is validated on the probe path)
+    if data["status"] == "ready":
+        return Response(
+            content=orjson.dumps({"success": True, "message": None, "data": data}),
+            media_type="application/json"
+        )
+
+    return Response(
+        status_code=503,
+        content=orjson.dumps({
+            "success": False,
+            "message": "Service not ready",
+            "data": None,
+            "error": {"code": "NOT_READY", "details": data},
+        }),
+        media_type="application/json"
+    )
@@ -10,7 +10,6 @@ from fastapi import APIRouter, Depends, Request, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from PIL import Image as PILImage
 
 from ..schema.response import SuccessResponse
 from ..schema.image import UploadImageResponse
@@ -122,6 +121,10 @@ async def upload_image(
         )
 
     # Step 3: Read image dimensions and validate image content
+    # (Pillow is imported here so app startup doesn't pay for it; only
+    # uploads use it)
+    from PIL import Image as PILImage
+
     try:
         image = PILImage.open(io.BytesIO(file_content))
         width, height = image.size
@@ -21,6 +21,7 @@ from ..schema.mosaic import (
 )
 from ..model import Mosaic, Node, Session, Connection, Subscription
 from ..dep import get_db_session, get_current_user
+from ..cache import invalidate_mosaic
 from ..model.user import User
 from ..exception import ConflictError, NotFoundError, PermissionError, ValidationError, InternalError
 from ..enum import MosaicStatus, SessionStatus
@@ -325,8 +326,12 @@ async def update_mosaic(
         mosaic.description = request.description
         logger.debug(f"Mosaic description updated: id={mosaic_id}")
 
-    # Update the updated_at timestamp
+    # Update the updated_at timestamp and commit
     mosaic.updated_at = datetime.now()
+    await session.commit()
+    # Invalidate only after the commit: a concurrent lookup before it would
+    # read (and re-cache) the old row
+    invalidate_mosaic(mosaic_id)
 
     # 6. Get statistics for response
     node_count_stmt = select(func.count(Node.id)).where(
@@ -468,6 +473,10 @@ async def delete_mosaic(
         raise InternalError(f"Failed to delete mosaic directory: {e}")
 
     # 5. Commit and return success
+    await session.commit()
+    # Invalidate only after the commit: a concurrent lookup before it would
+    # read (and re-cache) the still-live row
+    invalidate_mosaic(mosaic_id)
     logger.info(f"Mosaic deleted successfully: id={mosaic_id}")
     return SuccessResponse(data=None)
 
@@ -24,6 +24,7 @@ from ..schema.node import (
 )
 from ..model import Mosaic, Node, Session
 from ..dep import get_db_session, get_current_user
+from ..cache import invalidate_node
 from ..model.user import User
 from ..exception import ConflictError, NotFoundError, PermissionError, ValidationError, InternalError
 from ..enum import NodeStatus, SessionStatus, MosaicStatus
@@ -443,8 +444,12 @@ async def update_node(
         node.auto_start = request.auto_start
         logger.debug(f"Node auto_start updated: id={node.id}, auto_start={request.auto_start}")
 
-    # 6. Update the updated_at timestamp
+    # 6. Update the updated_at timestamp and commit
     node.updated_at = datetime.now()
+    await session.commit()
+    # Invalidate only after the commit: a concurrent lookup before it would
+    # read (and re-cache) the old row
+    invalidate_node(mosaic_id, node_id)
 
     # 7. Count active sessions for response
     session_count_stmt = select(func.count(Session.id)).where(
@@ -587,6 +592,10 @@ async def delete_node(
         raise InternalError(f"Failed to delete node directory: {e}")
 
     # 6. Commit and return success
+    await session.commit()
+    # Invalidate only after the commit: a concurrent lookup before it would
+    # read (and re-cache) the still-live row
+    invalidate_node(mosaic_id, node_id)
     logger.info(f"Node deleted successfully: id={node.id}, node_id={node_id}")
     return SuccessResponse(data=None)
 
@@ -1489,19 +1498,15 @@ async def get_code_server_url(
     instance_path = req.app.state.instance_path
     workspace_path = instance_path / "users" / str(current_user.id) / str(mosaic_id) / str(node.id)
 
-    # 4. Get code-server configuration
-    code_server_config = req.app.state.config.get('code_server', {})
-    external_host = code_server_config.get('external_host', 'localhost')
-    port = code_server_config.get('port', 20000)
-
-    # 5. Build URL with folder parameter
-    url = f"http://{external_host}:{port}/?folder={workspace_path}"
+    # 4. Build code-server URL with folder parameter (external host and port
+    #    are baked into the manager's URL prefix; the path is percent-encoded)
+    url = req.app.state.code_server_manager.get_url(workspace_path)
 
     logger.info(
         f"Code-server URL generated: node_db_id={node.id}, url={url}"
     )
 
-    # 6. Return response
+    # 5. Return response
     url_out = CodeServerUrlOut(
         url=url,
         workspace_path=str(workspace_path)
@@ -5,14 +5,17 @@ from datetime import datetime
 from math import ceil
 
 from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
-from typing import Annotated, Optional
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncMappingResult
+from sqlalchemy import select, update, func, text, bindparam, and_
+from sqlalchemy.engine import RowMapping
+from typing import Annotated, AsyncIterable, Optional
 
 from ..schema.response import SuccessResponse, PaginatedData
-from ..schema.session import CreateSessionRequest, SessionOut, SessionTopologyNode, SessionTopologyResponse, BatchArchiveResponse
+from ..schema.session import CreateSessionRequest, SessionOut, SessionTopologyResponse, BatchArchiveResponse
 from ..model import Session, Node, Mosaic, SessionRouting
 from ..dep import get_db_session, get_current_user
+from ..cache import get_cached_node, cache_node
 from ..model.user import User
 from ..exception import NotFoundError, PermissionError, ValidationError
 from ..enum import SessionStatus
@@ -29,6 +32,89 @@ SessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
 
 
+# ==================== Prebuilt Statements ====================
+# Built once at import time and executed with per-request parameters, so the
+# statement objects (and their compiled cache keys) are reused across requests.
+
+_MOSAIC_BY_ID_STMT = select(Mosaic).where(
+    Mosaic.id == bindparam("mosaic_id"),
+    Mosaic.deleted_at.is_(None)
+)
+
+_NODE_BY_ID_STMT = select(Node).where(
+    Node.mosaic_id == bindparam("mosaic_id"),
+    Node.node_id == bindparam("node_id"),
+    Node.deleted_at.is_(None)
+)
+
+_SESSION_BY_ID_STMT = select(Session).where(
+    Session.session_id == bindparam("session_id"),
+    Session.mosaic_id == bindparam("mosaic_id"),
+    Session.user_id == bindparam("user_id"),
+    Session.deleted_at.is_(None)
+)
+
+# Session plus its live node (outer join, so a missing node is reported separately)
+_SESSION_WITH_NODE_STMT = select(Session, Node).outerjoin(
+    Node,
+    and_(
+        Node.mosaic_id == Session.mosaic_id,
+        Node.node_id == Session.node_id,
+        Node.deleted_at.is_(None)
+    )
+).where(
+    Session.session_id == bindparam("session_id"),
+    Session.mosaic_id == bindparam("mosaic_id"),
+    Session.user_id == bindparam("user_id"),
+    Session.deleted_at.is_(None)
+)
+
+# SessionOut field names, used to build list_sessions items straight from rows
+_SESSION_OUT_FIELDS = tuple(SessionOut.model_fields)
+
+# Columns projected by list_sessions (everything SessionOut reads from sessions)
+_SESSION_OUT_COLUMNS = (
+    Session.id,
+    Session.session_id,
+    Session.user_id,
+    Session.mosaic_id,
+    Session.node_id,
+    Session.mode,
+    Session.model,
+    Session.status,
+    Session.runtime_status,
+    Session.topic,
+    Session.message_count,
+    Session.total_input_tokens,
+    Session.total_output_tokens,
+    Session.total_cost_usd,
+    Session.context_usage,
+    Session.context_percentage,
+    Session.created_at,
+    Session.updated_at,
+    Session.last_activity_at,
+    Session.closed_at,
+)
+
+# Parent session (this session is the remote side of a routing)
+_PARENT_SESSION_ID_SUBQUERY = select(
+    func.max(SessionRouting.local_session_id)
+).where(
+    SessionRouting.remote_session_id == Session.session_id,
+    SessionRouting.mosaic_id == Session.mosaic_id,
+    SessionRouting.deleted_at.is_(None)
+).correlate(Session).scalar_subquery().label("parent_session_id")
+
+# Number of direct child sessions (this session is the local side of a routing)
+_CHILD_COUNT_SUBQUERY = select(
+    func.count(SessionRouting.id)
+).where(
+    SessionRouting.local_session_id == Session.session_id,
+    SessionRouting.mosaic_id == Session.mosaic_id,
+    SessionRouting.deleted_at.is_(None)
+).correlate(Session).scalar_subquery().label("child_count")
+
+
 # ==================== API Endpoints ====================
 
 @router.post("", response_model=SuccessResponse[SessionOut])
@@ -63,43 +149,48 @@ async def create_session(
         RuntimeException: If runtime session creation fails
     """
     logger.info(
-        f"Creating session: mosaic_id={mosaic_id}, node_id={request.node_id}, "
-        f"mode={request.mode}, user_id={current_user.id}"
-    )
-
-    # 1. Query mosaic and verify ownership
-    mosaic_stmt = select(Mosaic).where(
-        Mosaic.id == mosaic_id,
-        Mosaic.deleted_at.is_(None)
+        "Creating session: mosaic_id=%s, node_id=%s, "
+        "mode=%s, user_id=%s",
+        mosaic_id, request.node_id, request.mode, current_user.id
     )
-    mosaic_result = await session.execute(mosaic_stmt)
-    mosaic = mosaic_result.scalar_one_or_none()
-
-    if not mosaic:
-        logger.warning(f"Mosaic not found: id={mosaic_id}")
-        raise NotFoundError("Mosaic not found")
 
-    if mosaic.user_id != current_user.id:
-        logger.warning(
-            f"Permission denied: mosaic_id={mosaic_id}, "
-            f"owner_id={mosaic.user_id}, requester_id={current_user.id}"
+    # 1-2. Resolve owned node (cache hit skips the mosaic and node queries)
+    node = get_cached_node(mosaic_id, request.node_id, current_user.id)
+    if node is None:
+        # 1. Query mosaic and verify ownership
+        mosaic_result = await session.execute(
+            _MOSAIC_BY_ID_STMT,
+            {"mosaic_id": mosaic_id}
         )
-        raise PermissionError("You do not have permission to create sessions in this mosaic")
+        mosaic = mosaic_result.scalar_one_or_none()
+
+        if not mosaic:
+            logger.warning("Mosaic not found: id=%s", mosaic_id)
+            raise NotFoundError("Mosaic not found")
+
+        if mosaic.user_id != current_user.id:
+            logger.warning(
+                "Permission denied: mosaic_id=%s, "
+                "owner_id=%s, requester_id=%s",
+                mosaic_id, mosaic.user_id, current_user.id
+            )
+            raise PermissionError("You do not have permission to create sessions in this mosaic")
+
+        # 2. Verify node exists
+        node_result = await session.execute(
+            _NODE_BY_ID_STMT,
+            {"mosaic_id": mosaic_id, "node_id": request.node_id}
+        )
+        node = node_result.scalar_one_or_none()
 
-    # 2. Verify node exists
-    node_stmt = select(Node).where(
-        Node.mosaic_id == mosaic_id,
-        Node.node_id == request.node_id,
-        Node.deleted_at.is_(None)
-    )
-    node_result = await session.execute(node_stmt)
-    node = node_result.scalar_one_or_none()
+        if not node:
+            logger.warning(
+                "Node not found: mosaic_id=%s, node_id=%s",
+                mosaic_id, request.node_id
+            )
+            raise NotFoundError(f"Node '{request.node_id}' not found in this mosaic")
 
-    if not node:
-        logger.warning(
-            f"Node not found: mosaic_id={mosaic_id}, node_id={request.node_id}"
-        )
-        raise NotFoundError(f"Node '{request.node_id}' not found in this mosaic")
+        cache_node(node)
 
     # 3. Create runtime session and get session_id
     # Note: Runtime layer will create the database record during session initialization
@@ -114,7 +205,7 @@ async def create_session(
         timeout=10.0
     )
 
-    logger.info(f"Runtime session created: session_id={session_id}")
+    logger.info("Runtime session created: session_id=%s", session_id)
 
     # 4. Query the database record created by runtime layer
     stmt = select(Session).where(Session.session_id == session_id)
@@ -122,33 +213,13 @@ async def create_session(
     db_session = result.scalar_one()
 
     logger.info(
-        f"Database session retrieved: id={db_session.id}, session_id={session_id}, "
-        f"node_id={request.node_id}, mode={request.mode}"
+        "Database session retrieved: id=%s, session_id=%s, "
+        "node_id=%s, mode=%s",
+        db_session.id, session_id, request.node_id, request.mode
     )
 
     # 5. Construct response
-    session_out = SessionOut(
-        id=db_session.id,
-        session_id=db_session.session_id,
-        user_id=db_session.user_id,
-        mosaic_id=db_session.mosaic_id,
-        node_id=db_session.node_id,
-        mode=db_session.mode,
-        model=db_session.model,
-        status=db_session.status,
-        runtime_status=db_session.runtime_status,
-        topic=db_session.topic,
-        message_count=db_session.message_count,
-        total_input_tokens=db_session.total_input_tokens,
-        total_output_tokens=db_session.total_output_tokens,
-        total_cost_usd=db_session.total_cost_usd,
-        context_usage=db_session.context_usage,
-        context_percentage=db_session.context_percentage,
-        created_at=db_session.created_at,
-        updated_at=db_session.updated_at,
-        last_activity_at=db_session.last_activity_at,
-        closed_at=db_session.closed_at
-    )
+    session_out = SessionOut.model_validate(db_session)
 
     return SuccessResponse(data=session_out)
 
@@ -165,7 +236,7 @@ async def close_session(
 
     Business logic:
     1. Query session and verify ownership
-    2. Query node for runtime close operation
+    2. Query node for runtime close operation (joined with step 1, single query)
     3. Verify session is currently ACTIVE
     4. Update database status to CLOSED
     5. Call RuntimeManager.close_session() to close runtime session
@@ -182,47 +253,41 @@ async def close_session(
         RuntimeException: If runtime session close fails
     """
     logger.info(
-        f"Closing session: mosaic_id={mosaic_id}, session_id={session_id}, "
-        f"user_id={current_user.id}"
+        "Closing session: mosaic_id=%s, session_id=%s, "
+        "user_id=%s",
+        mosaic_id, session_id, current_user.id
     )
 
-    # 1. Query session and verify ownership
-    stmt = select(Session).where(
-        Session.session_id == session_id,
-        Session.mosaic_id == mosaic_id,
-        Session.user_id == current_user.id,
-        Session.deleted_at.is_(None)
+    # 1-2. Query session (verifying ownership) and its node in one round-trip
+    result = await session.execute(
+        _SESSION_WITH_NODE_STMT,
+        {"session_id": session_id, "mosaic_id": mosaic_id, "user_id": current_user.id}
     )
-    result = await session.execute(stmt)
-    db_session = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not db_session:
+    if not row:
         logger.warning(
-            f"Session not found: session_id={session_id}, mosaic_id={mosaic_id}, "
-            f"user_id={current_user.id}"
+            "Session not found: session_id=%s, mosaic_id=%s, "
+            "user_id=%s",
+            session_id, mosaic_id, current_user.id
         )
         raise NotFoundError("Session not found")
 
-    # 2. Query node for runtime operation
-    node_stmt = select(Node).where(
-        Node.mosaic_id == mosaic_id,
-        Node.node_id == db_session.node_id,
-        Node.deleted_at.is_(None)
-    )
-    node_result = await session.execute(node_stmt)
-    node = node_result.scalar_one_or_none()
+    db_session, node = row
 
     if not node:
         logger.warning(
-            f"Node not found: mosaic_id={mosaic_id}, node_id={db_session.node_id}"
+            "Node not found: mosaic_id=%s, node_id=%s",
+            mosaic_id, db_session.node_id
         )
         raise NotFoundError(f"Node '{db_session.node_id}' not found")
 
     # 3. Verify session is ACTIVE
     if db_session.status != SessionStatus.ACTIVE:
         logger.warning(
-            f"Cannot close non-active session: session_id={session_id}, "
-            f"current_status={db_session.status}"
+            "Cannot close non-active session: session_id=%s, "
+            "current_status=%s",
+            session_id, db_session.status
         )
         raise ValidationError(
             f"Cannot close session with status '{db_session.status}'. "
@@ -237,39 +302,19 @@ async def close_session(
         timeout=10.0
     )
 
-    logger.info(f"Runtime session closed successfully: session_id={session_id}")
+    logger.info("Runtime session closed successfully: session_id=%s", session_id)
 
     # 5. Update database status to CLOSED (final confirmation after runtime cleanup)
+    now = datetime.now()
     db_session.status = SessionStatus.CLOSED
-    db_session.closed_at = datetime.now()
-    db_session.updated_at = datetime.now()
+    db_session.closed_at = now
+    db_session.updated_at = now
     await session.flush()
 
-    logger.info(f"Database session status updated to CLOSED: session_id={session_id}")
+    logger.info("Database session status updated to CLOSED: session_id=%s", session_id)
 
     # 6. Construct response
-    session_out = SessionOut(
-        id=db_session.id,
-        session_id=db_session.session_id,
-        user_id=db_session.user_id,
-        mosaic_id=db_session.mosaic_id,
-        node_id=db_session.node_id,
-        mode=db_session.mode,
-        model=db_session.model,
-        status=db_session.status,
-        runtime_status=db_session.runtime_status,
-        topic=db_session.topic,
-        message_count=db_session.message_count,
-        total_input_tokens=db_session.total_input_tokens,
-        total_output_tokens=db_session.total_output_tokens,
-        total_cost_usd=db_session.total_cost_usd,
-        context_usage=db_session.context_usage,
-        context_percentage=db_session.context_percentage,
-        created_at=db_session.created_at,
-        updated_at=db_session.updated_at,
-        last_activity_at=db_session.last_activity_at,
-        closed_at=db_session.closed_at
-    )
+    session_out = SessionOut.model_validate(db_session)
 
     return SuccessResponse(data=session_out)
 
@@ -284,11 +329,11 @@ async def archive_session(
     """Archive a closed session
 
     Business logic:
-    1. Query session and verify ownership
-    2. Verify session is currently CLOSED
-    3. Update status to ARCHIVED
-    4. Update updated_at timestamp
-    5. Return updated session
+    1. Atomically update status to ARCHIVED (and updated_at) where the session
+       exists, belongs to current user and is currently CLOSED
+    2. If nothing was updated, look the session up to distinguish
+       not-found from wrong-status
+    3. Return updated session
 
     Validation Rules:
     - Session must exist and belong to current user
@@ -300,67 +345,55 @@ async def archive_session(
         ValidationError: If session is not closed
     """
     logger.info(
-        f"Archiving session: mosaic_id={mosaic_id}, session_id={session_id}, "
-        f"user_id={current_user.id}"
+        "Archiving session: mosaic_id=%s, session_id=%s, "
+        "user_id=%s",
+        mosaic_id, session_id, current_user.id
     )
 
-    # 1. Query session and verify ownership
-    stmt = select(Session).where(
+    # 1. Conditionally archive in one statement (only matches owned CLOSED sessions)
+    stmt = update(Session).where(
         Session.session_id == session_id,
         Session.mosaic_id == mosaic_id,
         Session.user_id == current_user.id,
+        Session.status == SessionStatus.CLOSED,
         Session.deleted_at.is_(None)
-    )
+    ).values(
+        status=SessionStatus.ARCHIVED,
+        updated_at=datetime.now()
+    ).returning(Session)
     result = await session.execute(stmt)
     db_session = result.scalar_one_or_none()
 
+    # 2. No row updated: look the session up to report the precise reason
     if not db_session:
-        logger.warning(
-            f"Session not found: session_id={session_id}, mosaic_id={mosaic_id}, "
-            f"user_id={current_user.id}"
+        result = await session.execute(
+            _SESSION_BY_ID_STMT,
+            {"session_id": session_id, "mosaic_id": mosaic_id, "user_id": current_user.id}
         )
-        raise NotFoundError("Session not found")
+        existing_session = result.scalar_one_or_none()
+
+        if not existing_session:
+            logger.warning(
+                "Session not found: session_id=%s, mosaic_id=%s, "
+                "user_id=%s",
+                session_id, mosaic_id, current_user.id
+            )
+            raise NotFoundError("Session not found")
 
-    # 2. Verify session is CLOSED
-    if db_session.status != SessionStatus.CLOSED:
         logger.warning(
-            f"Cannot archive non-closed session: session_id={session_id}, "
-            f"current_status={db_session.status}"
+            "Cannot archive non-closed session: session_id=%s, "
+            "current_status=%s",
+            session_id, existing_session.status
         )
         raise ValidationError(
-            f"Cannot archive session with status '{db_session.status}'. "
+            f"Cannot archive session with status '{existing_session.status}'. "
             "Session must be closed before archiving."
         )
 
-    # 3. Update status to ARCHIVED
-    db_session.status = SessionStatus.ARCHIVED
-    db_session.updated_at = datetime.now()
-
-    logger.info(f"Session archived successfully: session_id={session_id}")
-
-    # 4. Construct response
-    session_out = SessionOut(
-        id=db_session.id,
-        session_id=db_session.session_id,
-        user_id=db_session.user_id,
-        mosaic_id=db_session.mosaic_id,
-        node_id=db_session.node_id,
-        mode=db_session.mode,
-        model=db_session.model,
-        status=db_session.status,
-        runtime_status=db_session.runtime_status,
-        topic=db_session.topic,
-        message_count=db_session.message_count,
-        total_input_tokens=db_session.total_input_tokens,
-        total_output_tokens=db_session.total_output_tokens,
-        total_cost_usd=db_session.total_cost_usd,
-        context_usage=db_session.context_usage,
-        context_percentage=db_session.context_percentage,
-        created_at=db_session.created_at,
-        updated_at=db_session.updated_at,
-        last_activity_at=db_session.last_activity_at,
-        closed_at=db_session.closed_at
-    )
+    logger.info("Session archived successfully: session_id=%s", session_id)
+
+    # 3. Construct response
+    session_out = SessionOut.model_validate(db_session)
 
     return SuccessResponse(data=session_out)
 
@@ -375,9 +408,9 @@ async def batch_archive_sessions(
     """Batch archive all closed sessions
 
     Business logic:
-    1. Query all closed sessions for current user in mosaic
+    1. Build a single UPDATE over closed sessions for current user in mosaic
     2. Optionally filter by node_id if provided
-    3. Update all sessions to ARCHIVED status
+    3. Set status to ARCHIVED server-side (RETURNING archived session IDs)
     4. Return count of archived sessions
 
     Query Parameters:
@@ -391,12 +424,14 @@ async def batch_archive_sessions(
         BatchArchiveResponse with archived_count and failed_sessions list
     """
     logger.info(
-        f"Batch archiving sessions: mosaic_id={mosaic_id}, node_id={node_id}, "
-        f"user_id={current_user.id}"
+        "Batch archiving sessions: mosaic_id=%s, node_id=%s, "
+        "user_id=%s",
+        mosaic_id, node_id, current_user.id
     )
 
-    # 1. Query all closed sessions
-    stmt = select(Session).where(
+    # 1. Build a single server-side UPDATE for all closed sessions
+    now = datetime.now()
+    stmt = update(Session).where(
         Session.mosaic_id == mosaic_id,
         Session.user_id == current_user.id,
         Session.status == SessionStatus.CLOSED,
@@ -407,49 +442,33 @@ async def batch_archive_sessions(
     if node_id:
         stmt = stmt.where(Session.node_id == node_id)
 
+    stmt = stmt.values(
+        status=SessionStatus.ARCHIVED,
+        updated_at=now
+    ).returning(Session.session_id).execution_options(synchronize_session=False)
+
+    # 2. Execute update (no rows are loaded into the ORM)
     result = await session.execute(stmt)
-    closed_sessions = result.scalars().all()
-
-    if not closed_sessions:
-        logger.info(f"No closed sessions to archive: mosaic_id={mosaic_id}, node_id={node_id}")
-        return SuccessResponse(data=BatchArchiveResponse(
-            archived_count=0,
-            failed_sessions=[]
-        ))
-
-    # 2. Update all sessions to ARCHIVED
-    archived_count = 0
-    failed_sessions = []
-    now = datetime.now()
+    archived_count = len(result.scalars().all())
 
-    for db_session in closed_sessions:
-        try:
-            db_session.status = SessionStatus.ARCHIVED
-            db_session.updated_at = now
-            archived_count += 1
-        except Exception as e:
-            logger.error(f"Failed to archive session {db_session.session_id}: {e}")
-            failed_sessions.append(db_session.session_id)
-
-    # 3. Commit changes
-    try:
-        await session.flush()
-        logger.info(
-            f"Batch archived {archived_count} sessions: mosaic_id={mosaic_id}, "
-            f"node_id={node_id}, failed={len(failed_sessions)}"
-        )
-    except Exception as e:
-        logger.error(f"Failed to commit batch archive: {e}")
-        raise
+    logger.info(
+        "Batch archived %s sessions: mosaic_id=%s, "
+        "node_id=%s",
+        archived_count, mosaic_id, node_id
+    )
 
-    # 4. Construct response
+    # 3. Construct response
     return SuccessResponse(data=BatchArchiveResponse(
         archived_count=archived_count,
-        failed_sessions=failed_sessions
+        failed_sessions=[]
     ))
 
 
-@router.get("", response_model=SuccessResponse[PaginatedData[SessionOut]])
+@router.get(
+    "",
+    response_model=SuccessResponse[PaginatedData[SessionOut]],
+    response_class=ORJSONResponse
+)
 async def list_sessions(
     mosaic_id: int,
     session: SessionDep,
@@ -470,8 +489,8 @@ async def list_sessions(
        - session_id (optional, exact match)
        - status (optional, exact match)
        - deleted_at IS NULL
-    2. Count total matching records
-    3. Apply pagination: ORDER BY last_activity_at DESC, LIMIT, OFFSET
+    2. Apply pagination: ORDER BY last_activity_at DESC, LIMIT, OFFSET
+    3. Count total matching records via COUNT(*) OVER () on the same query
     4. Return paginated results
 
     Query Parameters:
@@ -487,142 +506,171 @@ async def list_sessions(
     Note: Returns empty list if no sessions found
     """
     logger.info(
-        f"Listing sessions: mosaic_id={mosaic_id}, "
-        f"user_id={current_user.id}, filters={{node_id={node_id}, session_id={session_id}, status={status}}}, "
-        f"page={page}, page_size={page_size}"
+        "Listing sessions: mosaic_id=%s, "
+        "user_id=%s, filters={node_id=%s, session_id=%s, status=%s}, "
+        "page=%s, page_size=%s",
+        mosaic_id, current_user.id, node_id, session_id, status, page, page_size
     )
 
-    # 1. Build base query with filters
-    stmt = select(Session).where(
+    # 1. Build filter conditions
+    filters = [
         Session.mosaic_id == mosaic_id,
         Session.user_id == current_user.id,
         Session.deleted_at.is_(None)
-    )
+    ]
 
     # Apply optional filters
     if node_id:
-        stmt = stmt.where(Session.node_id == node_id)
+        filters.append(Session.node_id == node_id)
     if session_id:
-        stmt = stmt.where(Session.session_id == session_id)
+        filters.append(Session.session_id == session_id)
     if status:
-        stmt = stmt.where(Session.status == status)
+        filters.append(Session.status == status)
 
-    # 2. Count total records
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    count_result = await session.execute(count_stmt)
-    total = count_result.scalar() or 0
-
-    # 3. Calculate pagination
-    total_pages = ceil(total / page_size) if total > 0 else 0
+    # 2. Build paginated column query: SessionOut columns, parent/child routing
+    #    info as correlated subqueries and the total count as a window function,
+    #    so the page, its relations and the total come back in a single round-trip
     offset = (page - 1) * page_size
-
-    # 4. Apply sorting and pagination
-    stmt = stmt.order_by(Session.last_activity_at.desc()).offset(offset).limit(page_size)
-
-    # 5. Execute query
+    stmt = select(
+        *_SESSION_OUT_COLUMNS,
+        _PARENT_SESSION_ID_SUBQUERY,
+        _CHILD_COUNT_SUBQUERY,
+        func.count().over().label("total")
+    ).where(*filters).order_by(
+        Session.last_activity_at.desc()
+    ).offset(offset).limit(page_size)
+
+    # 3. Execute query (plain rows, no ORM entities)
     result = await session.execute(stmt)
-    sessions = result.scalars().all()
+    rows = result.all()
+
+    # 4. Resolve total count (fall back to COUNT only when paging past the end)
+    if rows:
+        total = rows[0].total
+    elif offset > 0:
+        count_stmt = select(func.count(Session.id)).where(*filters)
+        count_result = await session.execute(count_stmt)
+        total = count_result.scalar() or 0
+    else:
+        total = 0
+
+    # 5. Calculate pagination
+    total_pages = ceil(total / page_size) if total > 0 else 0
 
     logger.debug(
-        f"Found {len(sessions)} sessions (total={total}, page={page}/{total_pages})"
+        "Found %s sessions (total=%s, page=%s/%s)",
+        len(rows), total, page, total_pages
     )
 
-    # 6. Build response list with parent-child relationship info
-    session_ids = [s.session_id for s in sessions]
-
-    # 6.1 Batch query parent session mapping (remote -> local)
-    parent_map = {}
-    if session_ids:
-        parent_map_stmt = select(
-            SessionRouting.remote_session_id,
-            SessionRouting.local_session_id
-        ).where(
-            SessionRouting.remote_session_id.in_(session_ids),
-            SessionRouting.mosaic_id == mosaic_id,
-            SessionRouting.deleted_at.is_(None)
-        )
-        parent_result = await session.execute(parent_map_stmt)
-        parent_map = {row[0]: row[1] for row in parent_result.all()}
-
-    # 6.2 Batch query child session count (local -> count(remote))
-    child_count_map = {}
-    if session_ids:
-        child_count_stmt = select(
-            SessionRouting.local_session_id,
-            func.count(SessionRouting.remote_session_id)
-        ).where(
-            SessionRouting.local_session_id.in_(session_ids),
-            SessionRouting.mosaic_id == mosaic_id,
-            SessionRouting.deleted_at.is_(None)
-        ).group_by(SessionRouting.local_session_id)
-        child_result = await session.execute(child_count_stmt)
-        child_count_map = {row[0]: row[1] for row in child_result.all()}
-
-    # 6.3 Build response list with parent-child info
+    # 6. Build response items as plain dicts of the SessionOut fields
+    #    (trusted DB rows; the extra total column is dropped)
     session_list = [
-        SessionOut(
-            id=s.id,
-            session_id=s.session_id,
-            user_id=s.user_id,
-            mosaic_id=s.mosaic_id,
-            node_id=s.node_id,
-            mode=s.mode,
-            model=s.model,
-            status=s.status,
-            runtime_status=s.runtime_status,
-            topic=s.topic,
-            message_count=s.message_count,
-            total_input_tokens=s.total_input_tokens,
-            total_output_tokens=s.total_output_tokens,
-            total_cost_usd=s.total_cost_usd,
-            context_usage=s.context_usage,
-            context_percentage=s.context_percentage,
-            created_at=s.created_at,
-            updated_at=s.updated_at,
-            last_activity_at=s.last_activity_at,
-            closed_at=s.closed_at,
-            parent_session_id=parent_map.get(s.session_id),
-            child_count=child_count_map.get(s.session_id, 0)
-        )
-        for s in sessions
+        {field: row._mapping[field] for field in _SESSION_OUT_FIELDS}
+        for row in rows
     ]
 
-    # 7. Construct paginated response
-    paginated_data = PaginatedData(
-        items=session_list,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # 7. Construct paginated response (same shape as
+    #    SuccessResponse[PaginatedData[SessionOut]])
+    payload = {
+        "success": True,
+        "message": None,
+        "data": {
+            "items": session_list,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "next_cursor": None,
+        },
+    }
 
     logger.info(
-        f"Listed {len(session_list)} sessions: mosaic_id={mosaic_id}, "
-        f"filters={{node_id={node_id}}}, page={page}/{total_pages}, total={total}"
+        "Listed %s sessions: mosaic_id=%s, "
+        "filters={node_id=%s}, page=%s/%s, total=%s",
+        len(session_list), mosaic_id, node_id, page, total_pages, total
     )
 
-    return SuccessResponse(data=paginated_data)
+    # Return the payload directly: a Response instance bypasses FastAPI's
+    # response_model re-validation (response_model still documents it)
+    return ORJSONResponse(payload)
 
 
 # ==================== Helper Functions for Topology ====================
 
 
+# Recursive CTE for session tree traversal, built once at import time.
+# Depth is always bounded (100 when max_depth is not given) to stop runaway
+# recursion on cyclic routing data.
+_SESSION_TREE_CTE = text("""
+    WITH RECURSIVE session_tree AS (
+        -- Base case: root session (has no parent in the tree)
+        SELECT
+            :root_session_id AS session_id,
+            NULL AS parent_id,
+            s.node_id AS node_id,
+            0 AS depth,
+            s.status AS status,
+            s.created_at AS created_at,
+            s.closed_at AS closed_at
+        FROM sessions s
+        WHERE s.session_id = :root_session_id
+            AND s.mosaic_id = :mosaic_id
+            AND s.deleted_at IS NULL
+
+        UNION ALL
+
+        -- Recursive case: find children through session_routings
+        SELECT
+            sr.remote_session_id AS session_id,
+            sr.local_session_id AS parent_id,
+            sr.remote_node_id AS node_id,
+            st.depth + 1 AS depth,
+            COALESCE(s.status, 'UNKNOWN') AS status,
+            s.created_at AS created_at,
+            s.closed_at AS closed_at
+        FROM session_routings sr
+        INNER JOIN session_tree st ON sr.local_session_id = st.session_id
+        LEFT JOIN sessions s ON sr.remote_session_id = s.session_id
+        WHERE sr.mosaic_id = :mosaic_id
+            AND sr.deleted_at IS NULL
+            AND st.depth < COALESCE(:max_depth, 100)
+    )
+    SELECT
+        session_id,
+        parent_id,
+        node_id,
+        depth,
+        status,
+        created_at,
+        closed_at
+    FROM session_tree
+    ORDER BY depth, session_id
+""").bindparams(
+    bindparam("root_session_id"),
+    bindparam("mosaic_id"),
+    bindparam("max_depth")
+)
+
+# Rows fetched per batch when streaming the session tree
+_SESSION_TREE_BATCH_SIZE = 500
+
+
 async def fetch_session_tree(
     session: AsyncSession,
     mosaic_id: int,
     root_session_id: str,
     max_depth: Optional[int] = None
-) -> list[dict]:
-    """Fetch session tree using recursive CTE
+) -> AsyncMappingResult:
+    """Fetch session tree using recursive CTE (streamed in batches)
 
     Args:
         session: Database session
         mosaic_id: Mosaic ID to filter by
         root_session_id: Root session ID to start the tree from
-        max_depth: Optional maximum depth to traverse (None for unlimited)
+        max_depth: Optional maximum depth to traverse (None for default limit of 100)
 
     Returns:
-        List of session tree nodes with columns:
+        Async row mappings ordered by depth (streamed, consumed once) with columns:
         - session_id: str
         - parent_id: Optional[str]
         - node_id: str
@@ -631,56 +679,10 @@ async def fetch_session_tree(
         - created_at: datetime
         - closed_at: Optional[datetime]
     """
-    # Build recursive CTE query
-    cte_query = text("""
-        WITH RECURSIVE session_tree AS (
-            -- Base case: root session (has no parent in the tree)
-            SELECT
-                :root_session_id AS session_id,
-                NULL AS parent_id,
-                s.node_id AS node_id,
-                0 AS depth,
-                s.status AS status,
-                s.created_at AS created_at,
-                s.closed_at AS closed_at
-            FROM sessions s
-            WHERE s.session_id = :root_session_id
-                AND s.mosaic_id = :mosaic_id
-                AND s.deleted_at IS NULL
-
-            UNION ALL
-
-            -- Recursive case: find children through session_routings
-            SELECT
-                sr.remote_session_id AS session_id,
-                sr.local_session_id AS parent_id,
-                sr.remote_node_id AS node_id,
-                st.depth + 1 AS depth,
-                COALESCE(s.status, 'UNKNOWN') AS status,
-                s.created_at AS created_at,
-                s.closed_at AS closed_at
-            FROM session_routings sr
-            INNER JOIN session_tree st ON sr.local_session_id = st.session_id
-            LEFT JOIN sessions s ON sr.remote_session_id = s.session_id
-            WHERE sr.mosaic_id = :mosaic_id
-                AND sr.deleted_at IS NULL
-                AND (:max_depth IS NULL OR st.depth < :max_depth)
-        )
-        SELECT
-            session_id,
-            parent_id,
-            node_id,
-            depth,
-            status,
-            created_at,
-            closed_at
-        FROM session_tree
-        ORDER BY depth, session_id
-    """)
-
-    # Execute query
-    result = await session.execute(
-        cte_query,
+
+    # Stream query so tree construction starts before all rows arrive
+    result = await session.stream(
+        _SESSION_TREE_CTE.execution_options(yield_per=_SESSION_TREE_BATCH_SIZE),
         {
             "root_session_id": root_session_id,
             "mosaic_id": mosaic_id,
@@ -688,76 +690,74 @@ async def fetch_session_tree(
         }
     )
 
-    # Convert rows to dictionaries
-    rows = result.mappings().all()
-    return [dict(row) for row in rows]
+    return result.mappings()
 
 
-def build_tree_structure(
-    nodes: list[dict],
+async def build_tree_structure(
+    rows: AsyncIterable[RowMapping],
     root_session_id: str
-) -> Optional[SessionTopologyNode]:
-    """Build tree structure from flat node list
+) -> Optional[dict]:
+    """Build topology response data from session tree rows
+
+    Rows are collected into flat per-node lists while streaming (parents are
+    referenced by integer index), descendant counts are computed on those
+    integer arrays, and the nodes are linked into plain nested dicts. The
+    result is validated once via SessionTopologyResponse.model_validate()
+    instead of constructing one Pydantic model per node.
 
     Args:
-        nodes: Flat list of session nodes from fetch_session_tree()
+        rows: Row mappings from fetch_session_tree() (ordered by depth)
         root_session_id: Session ID of the root node
 
     Returns:
-        Root SessionTopologyNode with nested children, or None if root not found
+        Dict shaped like SessionTopologyResponse (root_session, total_nodes,
+        max_depth), or None if the root session is not in the rows
     """
-    if not nodes:
+    node_dicts: list[dict] = []
+    parent_indices: list[int] = []  # -1 when the node has no parent in the tree
+    index_of: dict[str, int] = {}
+
+    async for row in rows:
+        # Parents have smaller depth, so they are already indexed
+        parent_id = row['parent_id']
+        parent_indices.append(index_of.get(parent_id, -1) if parent_id else -1)
+        index_of[row['session_id']] = len(node_dicts)
+        node_dicts.append({
+            "session_id": row['session_id'],
+            "node_id": row['node_id'],
+            "status": row['status'].lower() if row['status'] else 'active',
+            "parent_session_id": parent_id,
+            "children": [],
+            "depth": row['depth'],
+            "descendant_count": 0,
+            "created_at": row['created_at'],
+            "closed_at": row['closed_at']
+        })
+
+    root_index = index_of.get(root_session_id)
+    if root_index is None:
         return None
 
-    # Create mapping from session_id to node data
-    node_map = {node['session_id']: node for node in nodes}
-
-    # Create mapping from session_id to SessionTopologyNode
-    topology_map: dict[str, SessionTopologyNode] = {}
-
-    # First pass: create all SessionTopologyNode objects
-    for node in nodes:
-        topology_map[node['session_id']] = SessionTopologyNode(
-            session_id=node['session_id'],
-            node_id=node['node_id'],
-            status=node['status'].lower() if node['status'] else 'active',
-            parent_session_id=node['parent_id'],
-            children=[],
-            depth=node['depth'],
-            descendant_count=0,  # Will be calculated in second pass
-            created_at=node['created_at'],
-            closed_at=node['closed_at']
-        )
-
-    # Second pass: build parent-child relationships
-    for node in nodes:
-        session_id = node['session_id']
-        parent_id = node['parent_id']
+    # Calculate descendant counts bottom-up: walking nodes in reverse depth
+    # order guarantees every child is final before it is added to its parent
+    descendant_counts = [0] * len(node_dicts)
+    for index in range(len(node_dicts) - 1, -1, -1):
+        parent_index = parent_indices[index]
+        if parent_index >= 0:
+            descendant_counts[parent_index] += 1 + descendant_counts[index]
 
-        if parent_id and parent_id in topology_map:
-            # Add current node to parent's children
-            topology_map[parent_id].children.append(topology_map[session_id])
+    # Link children to parents (in row order)
+    for index, node_dict in enumerate(node_dicts):
+        node_dict["descendant_count"] = descendant_counts[index]
+        parent_index = parent_indices[index]
+        if parent_index >= 0:
+            node_dicts[parent_index]["children"].append(node_dict)
 
-    # Third pass: calculate descendant counts (bottom-up)
-    def calculate_descendants(node: SessionTopologyNode) -> int:
-        """Recursively calculate descendant count"""
-        if not node.children:
-            node.descendant_count = 0
-            return 0
-
-        total = len(node.children)
-        for child in node.children:
-            total += calculate_descendants(child)
-
-        node.descendant_count = total
-        return total
-
-    # Get root node and calculate descendants
-    root_node = topology_map.get(root_session_id)
-    if root_node:
-        calculate_descendants(root_node)
-
-    return root_node
+    return {
+        "root_session": node_dicts[root_index],
+        "total_nodes": len(node_dicts),
+        "max_depth": max(node_dict["depth"] for node_dict in node_dicts)
+    }
 
 
 @router.get("/{session_id}/topology", response_model=SuccessResponse[SessionTopologyResponse])
@@ -766,7 +766,7 @@ async def get_session_topology(
     session_id: str,
     session: SessionDep,
     current_user: CurrentUserDep,
-    max_depth: Optional[int] = Query(None, ge=1, le=100, description="Maximum depth to traverse (optional)")
+    max_depth: Optional[int] = Query(None, ge=1, le=100, description="Maximum depth to traverse (default 100)")
 ):
     """Get session topology tree starting from a root session
 
@@ -778,7 +778,7 @@ async def get_session_topology(
     5. Return tree structure with root node
 
     Query Parameters:
-    - max_depth: Optional limit on tree traversal depth (1-100, default unlimited)
+    - max_depth: Optional limit on tree traversal depth (1-100, default 100)
 
     Returns:
         Session topology tree with root session and all descendants
@@ -794,61 +794,51 @@ async def get_session_topology(
         PermissionError: If session doesn't belong to current user
     """
     logger.info(
-        f"Fetching session topology: mosaic_id={mosaic_id}, session_id={session_id}, "
-        f"user_id={current_user.id}, max_depth={max_depth}"
+        "Fetching session topology: mosaic_id=%s, session_id=%s, "
+        "user_id=%s, max_depth=%s",
+        mosaic_id, session_id, current_user.id, max_depth
     )
 
     # 1. Verify root session exists and belongs to current user
-    stmt = select(Session).where(
-        Session.session_id == session_id,
-        Session.mosaic_id == mosaic_id,
-        Session.user_id == current_user.id,
-        Session.deleted_at.is_(None)
+    result = await session.execute(
+        _SESSION_BY_ID_STMT,
+        {"session_id": session_id, "mosaic_id": mosaic_id, "user_id": current_user.id}
     )
-    result = await session.execute(stmt)
     root_session = result.scalar_one_or_none()
 
     if not root_session:
         logger.warning(
-            f"Root session not found or access denied: session_id={session_id}, "
-            f"mosaic_id={mosaic_id}, user_id={current_user.id}"
+            "Root session not found or access denied: session_id=%s, "
+            "mosaic_id=%s, user_id=%s",
+            session_id, mosaic_id, current_user.id
         )
         raise NotFoundError("Session not found")
 
     # 2. Fetch session tree using recursive CTE
-    tree_nodes = await fetch_session_tree(
+    tree_rows = await fetch_session_tree(
         session=session,
         mosaic_id=mosaic_id,
         root_session_id=session_id,
         max_depth=max_depth
     )
 
-    logger.debug(f"Fetched {len(tree_nodes)} nodes in session tree")
-
-    # 3. Build tree structure
-    root_topology = build_tree_structure(
-        nodes=tree_nodes,
+    # 3. Build tree structure and statistics
+    topology_data = await build_tree_structure(
+        rows=tree_rows,
         root_session_id=session_id
     )
 
-    if not root_topology:
-        logger.error(f"Failed to build tree structure for session_id={session_id}")
+    if not topology_data:
+        logger.error("Failed to build tree structure for session_id=%s", session_id)
         raise NotFoundError("Failed to build session tree")
 
-    # 4. Calculate tree statistics
-    total_nodes = len(tree_nodes)
-    max_depth_actual = max((node['depth'] for node in tree_nodes), default=0)
-
     logger.info(
-        f"Session topology built: session_id={session_id}, total_nodes={total_nodes}, "
-        f"max_depth={max_depth_actual}"
+        "Session topology built: session_id=%s, total_nodes=%s, "
+        "max_depth=%s",
+        session_id, topology_data["total_nodes"], topology_data["max_depth"]
     )
 
-    # 5. Construct response
-    topology_response = SessionTopologyResponse(
-        root_session=root_topology,
-        total_nodes=total_nodes,
-        max_depth=max_depth_actual
-    )
+    # 4. Construct response (whole tree validated in one call)
+    topology_response = SessionTopologyResponse.model_validate(topology_data)
 
     return SuccessResponse(data=topology_response)
@@ -4,13 +4,18 @@ import logging
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_, lambda_stmt
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from ..schema.response import SuccessResponse, PaginatedData
 from ..schema.session_routing import SessionRoutingOut
 from ..model import SessionRouting
 from ..dep import get_db_session, get_current_user
+from ..pagination import encode_cursor, decode_cursor, MAX_OFFSET
+from ..cache import TTLCache
+from ..exception import ValidationError
 from ..model.user import User
 
 logger = logging.getLogger(__name__)
@@ -25,9 +30,61 @@ SessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
 
 
+# ==================== Caches ====================
+
+# SessionRoutingOut field names, used to build response items straight from rows
+_ROUTING_OUT_FIELDS = tuple(SessionRoutingOut.model_fields)
+
+# Total counts keyed by (mosaic_id, user_id, *filters); routings change only
+# through the runtime, so a slightly stale total is acceptable
+_count_cache = TTLCache(maxsize=10_000, ttl=30.0)
+
+
+# ==================== Helper Functions ====================
+# List statements are built with lambda_stmt(): SQLAlchemy caches the SQL
+# construct per lambda code location and only extracts the closure values as
+# bound parameters, so repeated requests skip statement construction and
+# compilation. Each optional filter is a separate lambda appended behind an
+# `if`, so every filter combination gets its own cache entry.
+
+
+def _add_routing_filters(
+    stmt: StatementLambdaElement,
+    local_node_id: str | None,
+    local_session_id: str | None,
+    remote_node_id: str | None,
+    remote_session_id: str | None,
+) -> StatementLambdaElement:
+    """Append the optional equality filters shared by the data and count queries
+
+    Args:
+        stmt: Lambda statement selecting from session_routings
+        local_node_id: Optional local node filter
+        local_session_id: Optional local session filter
+        remote_node_id: Optional remote node filter
+        remote_session_id: Optional remote session filter
+
+    Returns:
+        Lambda statement with the provided filters applied
+    """
+    if local_node_id is not None:
+        stmt += lambda s: s.where(SessionRouting.local_node_id == local_node_id)
+    if local_session_id is not None:
+        stmt += lambda s: s.where(SessionRouting.local_session_id == local_session_id)
+    if remote_node_id is not None:
+        stmt += lambda s: s.where(SessionRouting.remote_node_id == remote_node_id)
+    if remote_session_id is not None:
+        stmt += lambda s: s.where(SessionRouting.remote_session_id == remote_session_id)
+    return stmt
+
+
 # ==================== API Endpoints ====================
 
-@router.get("", response_model=SuccessResponse[PaginatedData[SessionRoutingOut]])
+@router.get(
+    "",
+    response_model=SuccessResponse[PaginatedData[SessionRoutingOut]],
+    response_class=ORJSONResponse
+)
 async def list_session_routings(
     mosaic_id: int,
     session: SessionDep,
@@ -36,8 +93,10 @@ async def list_session_routings(
     local_session_id: str | None = Query(None, description="Filter by local session ID"),
     remote_node_id: str | None = Query(None, description="Filter by remote node ID"),
     remote_session_id: str | None = Query(None, description="Filter by remote session ID"),
-    page: int = Query(1, ge=1, description="Page number (starts from 1)"),
+    page: int = Query(1, ge=1, description="Page number (starts from 1, ignored when cursor is given)"),
     page_size: int = Query(100, ge=1, le=1000, description="Number of items per page"),
+    cursor: str | None = Query(None, description="Keyset cursor from a previous page's next_cursor"),
+    with_total: bool = Query(False, description="Include total/total_pages (cached for up to 30 seconds)"),
 ):
     """List all session routings in a mosaic with filters and pagination
 
@@ -48,15 +107,20 @@ async def list_session_routings(
        - local_session_id
        - remote_node_id
        - remote_session_id
-    3. Query total count (for pagination metadata)
-    4. Order by created_at DESC (newest first)
-    5. Apply pagination (calculate offset from page and page_size)
-    6. Query routing items
-    7. Return paginated response with metadata
+    3. Order by created_at DESC, id DESC (newest first)
+    4. Apply pagination:
+       - cursor mode: WHERE (created_at, id) < cursor (constant cost per page)
+       - page mode: OFFSET computed from page and page_size
+    5. Query routing items (one extra row to detect whether a next page exists),
+       plus the total count only if with_total is set and not in cursor mode
+       (served from a short-lived cache, otherwise fused into the same query
+       with a COUNT(*) OVER () window)
+    6. Return paginated response with metadata and next_cursor
 
     Validation Rules:
     - page must be >= 1
     - page_size must be between 1 and 1000
+    - (page - 1) * page_size must not exceed MAX_OFFSET (use cursor beyond it)
 
     Note:
     - Returns empty items list if no routings found (doesn't raise exception)
@@ -64,80 +128,148 @@ async def list_session_routings(
     - Session routings use soft delete (deleted_at field)
 
     Raises:
-        (No exceptions raised - returns empty list if no routings found)
+        ValidationError: If the cursor is malformed or the page offset exceeds MAX_OFFSET
     """
-    logger.info(
-        f"Listing session routings: mosaic_id={mosaic_id}, user_id={current_user.id}, "
-        f"filters=(local_node={local_node_id}, local_session={local_session_id}, "
-        f"remote_node={remote_node_id}, remote_session={remote_session_id}), "
-        f"pagination=(page={page}, page_size={page_size})"
+    logger.debug(
+        "Listing session routings: mosaic_id=%s, user_id=%s, "
+        "filters=(local_node=%s, local_session=%s, "
+        "remote_node=%s, remote_session=%s), "
+        "pagination=(page=%s, page_size=%s)",
+        mosaic_id, current_user.id, local_node_id, local_session_id,
+        remote_node_id, remote_session_id, page, page_size
     )
 
-    # 1. Build base WHERE clause (will be reused for both count and data queries)
-    base_where = [
+    # 1. Build data query with the base WHERE clause (cached lambda statement),
+    #    projecting only the response columns plus id for the cursor
+    user_id = current_user.id
+    data_stmt = lambda_stmt(lambda: select(
+        SessionRouting.id,
+        SessionRouting.local_node_id,
+        SessionRouting.local_session_id,
+        SessionRouting.remote_node_id,
+        SessionRouting.remote_session_id,
+        SessionRouting.created_at
+    ).where(
         SessionRouting.mosaic_id == mosaic_id,
-        SessionRouting.user_id == current_user.id,
+        SessionRouting.user_id == user_id,
         SessionRouting.deleted_at.is_(None)
-    ]
+    ))
 
     # 2. Apply optional filters
-    if local_node_id is not None:
-        base_where.append(SessionRouting.local_node_id == local_node_id)
-    if local_session_id is not None:
-        base_where.append(SessionRouting.local_session_id == local_session_id)
-    if remote_node_id is not None:
-        base_where.append(SessionRouting.remote_node_id == remote_node_id)
-    if remote_session_id is not None:
-        base_where.append(SessionRouting.remote_session_id == remote_session_id)
-
-    # 3. Query total count
-    count_stmt = select(func.count(SessionRouting.id)).where(*base_where)
-    count_result = await session.execute(count_stmt)
-    total = count_result.scalar() or 0
+    data_stmt = _add_routing_filters(
+        data_stmt, local_node_id, local_session_id, remote_node_id, remote_session_id
+    )
 
-    logger.debug(f"Total session routings matching filters: {total}")
+    # 3. Order newest first (id breaks created_at ties for keyset)
+    data_stmt += lambda s: s.order_by(
+        SessionRouting.created_at.desc(),
+        SessionRouting.id.desc()
+    )
 
-    # 4. Calculate pagination
-    offset = (page - 1) * page_size
-    total_pages = (total + page_size - 1) // page_size  # Ceiling division
+    # 4. Apply pagination (fetch one extra row to detect a next page)
+    if cursor is not None:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        data_stmt += lambda s: s.where(
+            tuple_(SessionRouting.created_at, SessionRouting.id)
+            < tuple_(cursor_created_at, cursor_id)
+        )
+    else:
+        offset = (page - 1) * page_size
+        if offset > MAX_OFFSET:
+            logger.warning(
+                "Rejected deep offset pagination: mosaic_id=%s, user_id=%s, offset=%s",
+                mosaic_id, user_id, offset
+            )
+            raise ValidationError(
+                f"Use cursor pagination beyond offset {MAX_OFFSET}"
+            )
+        data_stmt += lambda s: s.offset(offset)
+    limit = page_size + 1
+    data_stmt += lambda s: s.limit(limit)
 
-    # 5. Build data query with ordering and pagination
-    data_stmt = select(SessionRouting).where(*base_where)
-    data_stmt = data_stmt.order_by(SessionRouting.created_at.desc())
-    data_stmt = data_stmt.limit(page_size).offset(offset)
+    # 5. Execute data query, and the total count if requested (opt-in; cursor
+    #    mode skips it so deep pages stay constant-cost). On a count cache miss
+    #    the count is fused into the page query as COUNT(*) OVER (), which is
+    #    evaluated before LIMIT/OFFSET, so one query and one scan serve both.
+    total = None
+    total_pages = None
+    count_in_page = False
+    if with_total and cursor is None:
+        count_key = (
+            mosaic_id, user_id,
+            local_node_id, local_session_id, remote_node_id, remote_session_id
+        )
+        total = _count_cache.get(count_key)
+        if total is None:
+            count_in_page = True
+            data_stmt += lambda s: s.add_columns(func.count().over().label("total"))
 
-    # 6. Execute data query
     result = await session.execute(data_stmt)
-    routings = result.scalars().all()
+    routings = result.mappings().all()
+
+    if count_in_page:
+        if routings:
+            total = routings[0]["total"]
+        elif offset == 0:
+            total = 0
+        else:
+            # Page past the end: no rows carry the window count, count directly
+            count_stmt = lambda_stmt(lambda: select(func.count(SessionRouting.id)).where(
+                SessionRouting.mosaic_id == mosaic_id,
+                SessionRouting.user_id == user_id,
+                SessionRouting.deleted_at.is_(None)
+            ))
+            count_stmt = _add_routing_filters(
+                count_stmt, local_node_id, local_session_id, remote_node_id, remote_session_id
+            )
+            count_result = await session.execute(count_stmt)
+            total = count_result.scalar() or 0
+        _count_cache.set(count_key, total)
+
+    if total is not None:
+        total_pages = (total + page_size - 1) // page_size  # Ceiling division
+        logger.debug("Total session routings matching filters: %s", total)
+
+    next_cursor = None
+    if len(routings) > page_size:
+        routings = routings[:page_size]
+        last_routing = routings[-1]
+        next_cursor = encode_cursor(last_routing["created_at"], last_routing["id"])
 
     logger.debug(
-        f"Retrieved {len(routings)} session routings for page {page}: "
-        f"mosaic_id={mosaic_id}, user_id={current_user.id}"
+        "Retrieved %s session routings for page %s: "
+        "mosaic_id=%s, user_id=%s",
+        len(routings), page, mosaic_id, current_user.id
     )
 
-    # 7. Build response items
+    # 6. Build response items as plain dicts of the SessionRoutingOut fields
+    #    (trusted DB rows; the extra id and total columns are dropped)
     items = [
-        SessionRoutingOut(
-            local_node_id=routing.local_node_id,
-            local_session_id=routing.local_session_id,
-            remote_node_id=routing.remote_node_id,
-            remote_session_id=routing.remote_session_id,
-            created_at=routing.created_at
-        )
+        {field: routing[field] for field in _ROUTING_OUT_FIELDS}
         for routing in routings
     ]
 
-    # 8. Construct paginated response
-    paginated_data = PaginatedData(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # 7. Construct paginated response (same shape as
+    #    SuccessResponse[PaginatedData[SessionRoutingOut]])
+    payload = {
+        "success": True,
+        "message": None,
+        "data": {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+        },
+    }
 
     logger.info(
-        f"Listed session routings: mosaic_id={mosaic_id}, user_id={current_user.id}, "
-        f"page={page}/{total_pages}, items={len(items)}, total={total}"
+        "Listed session routings: mosaic_id=%s, user_id=%s, "
+        "page=%s/%s, items=%s, total=%s",
+        mosaic_id, current_user.id, page, total_pages, len(items), total
     )
-    return SuccessResponse(data=paginated_data)
+    # Return the payload directly: a Response instance bypasses FastAPI's
+    # response_model re-validation (response_model still documents it) and
+    # orjson encodes the dicts, datetimes and enums natively
+    return ORJSONResponse(payload)
@@ -3,21 +3,26 @@
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Request
+import orjson
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Annotated
+from sqlalchemy import select, update, bindparam, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Annotated, AsyncIterator
 
-from ..schema.response import SuccessResponse
+from ..schema.response import SuccessResponse, PaginatedData
 from ..schema.subscription import (
     CreateSubscriptionRequest,
     UpdateSubscriptionRequest,
     SubscriptionOut,
 )
 from ..model import Subscription, Connection, Mosaic
-from ..dep import get_db_session, get_current_user
+from ..dep import get_db_session, get_current_user, get_owned_mosaic
+from ..pagination import encode_cursor, decode_cursor
 from ..model.user import User
-from ..exception import ConflictError, NotFoundError, PermissionError, ValidationError
+from ..exception import ConflictError, NotFoundError, ValidationError
 from ..enum import MosaicStatus
 
 logger = logging.getLogger(__name__)
@@ -30,6 +35,101 @@ router = APIRouter(prefix="/mosaics/{mosaic_id}/subscriptions", tags=["Subscript
 
 SessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
+OwnedMosaicDep = Annotated[Mosaic, Depends(get_owned_mosaic)]
+
+
+# ==================== Prebuilt Statements ====================
+
+# Endpoints of the requested connection (only the columns subscriptions denormalize)
+_CONNECTION_NODES_STMT = select(
+    Connection.source_node_id,
+    Connection.target_node_id
+).where(
+    Connection.id == bindparam("connection_id"),
+    Connection.mosaic_id == bindparam("mosaic_id"),
+    Connection.user_id == bindparam("user_id"),
+    Connection.deleted_at.is_(None)
+)
+
+# Columns projected by list_subscriptions (everything SubscriptionOut reads)
+_SUBSCRIPTION_OUT_COLUMNS = (
+    Subscription.id,
+    Subscription.user_id,
+    Subscription.mosaic_id,
+    Subscription.connection_id,
+    Subscription.source_node_id,
+    Subscription.target_node_id,
+    Subscription.event_type,
+    Subscription.description,
+    Subscription.created_at,
+    Subscription.updated_at,
+)
+
+
+# ==================== Helper Functions ====================
+
+# Rows fetched and encoded per streamed chunk
+_STREAM_BATCH_SIZE = 200
+
+
+async def _stream_subscriptions(
+    async_session_factory,
+    stmt,
+    limit: int,
+    mosaic_id: int,
+    user_id: int,
+) -> AsyncIterator[bytes]:
+    """Stream one page of subscription rows as a SuccessResponse JSON body
+
+    Args:
+        async_session_factory: SQLAlchemy async session factory
+        stmt: Keyset page select of the SubscriptionOut fields, limited to limit + 1
+              rows (the extra row only signals that a next page exists)
+        limit: Page size
+        mosaic_id: Mosaic ID (for logging)
+        user_id: Requesting user's ID (for logging)
+
+    Yields:
+        Chunks of the JSON body; each chunk holds a batch of encoded rows,
+        the last one the pagination metadata including next_cursor
+    """
+    count = 0
+    last_row = None
+    has_more = False
+    async with async_session_factory() as stream_session:
+        result = await stream_session.stream(
+            stmt.execution_options(yield_per=_STREAM_BATCH_SIZE)
+        )
+
+        yield b'{"success":true,"message":null,"data":{"items":['
+        async for partition in result.mappings().partitions():
+            rows = partition[:limit - count]
+            has_more = len(rows) < len(partition)
+            if rows:
+                chunk = b",".join(orjson.dumps(dict(row)) for row in rows)
+                yield chunk if count == 0 else b"," + chunk
+                count += len(rows)
+                last_row = rows[-1]
+            if has_more:
+                break
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(last_row["created_at"], last_row["id"])
+    metadata = orjson.dumps({
+        "total": None,
+        "page": 1,
+        "page_size": limit,
+        "total_pages": None,
+        "next_cursor": next_cursor,
+    })
+    # Close the items array, then splice the metadata object's members into data
+    yield b"]," + metadata[1:] + b"}"
+
+    logger.info(
+        "Listed %s subscriptions: mosaic_id=%s, user_id=%s",
+        count, mosaic_id, user_id
+    )
 
 
 # ==================== API Endpoints ====================
@@ -41,19 +141,20 @@ async def create_subscription(
     req: Request,
     session: SessionDep,
     current_user: CurrentUserDep,
+    mosaic: OwnedMosaicDep,
 ):
     """Create a new subscription on top of an existing connection
 
     Business logic:
-    1. Query mosaic and verify ownership
+    1. Resolve mosaic and verify ownership (OwnedMosaicDep)
     2. Verify mosaic is stopped (cannot modify running mosaic)
-    3. Query connection by connection_id and verify:
+    3. Query connection endpoints and verify:
        - Connection exists and belongs to the specified mosaic
        - Connection belongs to current user
     4. Extract source_node_id and target_node_id from connection (denormalization)
-    5. Check if subscription already exists (unique constraint check)
-    6. Create Subscription record
-    7. Return created subscription
+    5. Insert Subscription record with ON CONFLICT DO NOTHING on the active
+       unique index (an empty RETURNING means the subscription already exists)
+    6. Return created subscription
 
     Validation Rules:
     - Mosaic must exist and belong to current user
@@ -68,177 +169,151 @@ async def create_subscription(
         ConflictError: If subscription already exists
     """
     logger.info(
-        f"Creating subscription: mosaic_id={mosaic_id}, "
-        f"connection_id={request.connection_id}, event_type={request.event_type}, "
-        f"user_id={current_user.id}"
+        "Creating subscription: mosaic_id=%s, "
+        "connection_id=%s, event_type=%s, "
+        "user_id=%s",
+        mosaic_id, request.connection_id, request.event_type, current_user.id
     )
 
-    # 1. Query mosaic and verify ownership
-    mosaic_stmt = select(Mosaic).where(
-        Mosaic.id == mosaic_id,
-        Mosaic.deleted_at.is_(None)
-    )
-    mosaic_result = await session.execute(mosaic_stmt)
-    mosaic = mosaic_result.scalar_one_or_none()
-
-    if not mosaic:
-        logger.warning(f"Mosaic not found: id={mosaic_id}")
-        raise NotFoundError("Mosaic not found")
-
-    if mosaic.user_id != current_user.id:
-        logger.warning(
-            f"Permission denied: mosaic_id={mosaic_id}, "
-            f"owner_id={mosaic.user_id}, requester_id={current_user.id}"
-        )
-        raise PermissionError("You do not have permission to create subscriptions in this mosaic")
+    # 1. Mosaic existence and ownership are verified by OwnedMosaicDep
 
     # 2. Verify mosaic is stopped
     runtime_manager = req.app.state.runtime_manager
     status = await runtime_manager.get_mosaic_status(mosaic)
     if status == MosaicStatus.RUNNING:
-        logger.warning(f"Cannot modify running mosaic: id={mosaic_id}")
+        logger.warning("Cannot modify running mosaic: id=%s", mosaic_id)
         raise ValidationError("Cannot create subscription in running mosaic. Please stop it first.")
 
-    # 3. Query connection and verify ownership
-    connection_stmt = select(Connection).where(
-        Connection.id == request.connection_id,
-        Connection.mosaic_id == mosaic_id,
-        Connection.user_id == current_user.id,
-        Connection.deleted_at.is_(None)
+    # 3. Query connection endpoints and verify ownership
+    result = await session.execute(
+        _CONNECTION_NODES_STMT,
+        {"connection_id": request.connection_id, "mosaic_id": mosaic_id, "user_id": current_user.id}
     )
-    connection_result = await session.execute(connection_stmt)
-    connection = connection_result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not connection:
+    if not row:
         logger.warning(
-            f"Connection not found: id={request.connection_id}, mosaic_id={mosaic_id}, "
-            f"user_id={current_user.id}"
+            "Connection not found: id=%s, mosaic_id=%s, "
+            "user_id=%s",
+            request.connection_id, mosaic_id, current_user.id
         )
         raise NotFoundError(
             f"Connection with id {request.connection_id} not found in this mosaic"
         )
 
     # 4. Extract source_node_id and target_node_id from connection
-    source_node_id = connection.source_node_id
-    target_node_id = connection.target_node_id
-
+    source_node_id, target_node_id = row
     logger.debug(
-        f"Connection found: id={connection.id}, "
-        f"source={source_node_id}, target={target_node_id}"
+        "Connection found: id=%s, "
+        "source=%s, target=%s",
+        request.connection_id, source_node_id, target_node_id
     )
 
-    # 5. Check for existing subscription
-    existing_stmt = select(Subscription).where(
-        Subscription.mosaic_id == mosaic_id,
-        Subscription.source_node_id == source_node_id,
-        Subscription.target_node_id == target_node_id,
-        Subscription.event_type == request.event_type,
-        Subscription.deleted_at.is_(None)
-    )
-    existing_result = await session.execute(existing_stmt)
-    existing_subscription = existing_result.scalar_one_or_none()
+    # 5. Insert Subscription record, skipped if an active duplicate exists
+    now = datetime.now()
+    insert_stmt = sqlite_insert(Subscription).values(
+        user_id=current_user.id,
+        mosaic_id=mosaic_id,
+        connection_id=request.connection_id,
+        source_node_id=source_node_id,
+        target_node_id=target_node_id,
+        event_type=request.event_type,
+        description=request.description,
+        created_at=now,
+        updated_at=now
+    ).on_conflict_do_nothing(
+        index_elements=["mosaic_id", "source_node_id", "target_node_id", "event_type"],
+        index_where=Subscription.deleted_at.is_(None)
+    ).returning(Subscription)
+    result = await session.execute(insert_stmt)
+    subscription = result.scalar_one_or_none()
 
-    if existing_subscription:
+    if not subscription:
         logger.warning(
-            f"Subscription already exists: mosaic_id={mosaic_id}, "
-            f"source={source_node_id}, target={target_node_id}, event_type={request.event_type}"
+            "Subscription already exists: mosaic_id=%s, "
+            "source=%s, target=%s, event_type=%s",
+            mosaic_id, source_node_id, target_node_id, request.event_type
         )
         raise ConflictError(
             f"Subscription from '{source_node_id}' to '{target_node_id}' "
             f"for event type '{request.event_type}' already exists"
         )
 
-    # 6. Create Subscription record
-    subscription = Subscription(
-        user_id=current_user.id,
-        mosaic_id=mosaic_id,
-        connection_id=request.connection_id,
-        source_node_id=source_node_id,
-        target_node_id=target_node_id,
-        event_type=request.event_type,
-        description=request.description
-    )
-    session.add(subscription)
-    await session.flush()
-
     logger.info(
-        f"Subscription created: id={subscription.id}, mosaic_id={mosaic_id}, "
-        f"source={source_node_id}, target={target_node_id}, event_type={request.event_type}"
+        "Subscription created: id=%s, mosaic_id=%s, "
+        "source=%s, target=%s, event_type=%s",
+        subscription.id, mosaic_id, source_node_id, target_node_id, request.event_type
     )
 
-    # 7. Construct response
-    subscription_out = SubscriptionOut(
-        id=subscription.id,
-        user_id=subscription.user_id,
-        mosaic_id=subscription.mosaic_id,
-        connection_id=subscription.connection_id,
-        source_node_id=subscription.source_node_id,
-        target_node_id=subscription.target_node_id,
-        event_type=subscription.event_type,
-        description=subscription.description,
-        created_at=subscription.created_at,
-        updated_at=subscription.updated_at
-    )
+    # 6. Construct response
+    subscription_out = SubscriptionOut.model_validate(subscription)
 
     return SuccessResponse(data=subscription_out)
 
 
-@router.get("", response_model=SuccessResponse[list[SubscriptionOut]])
+@router.get("", response_model=SuccessResponse[PaginatedData[SubscriptionOut]])
 async def list_subscriptions(
     mosaic_id: int,
-    session: SessionDep,
+    req: Request,
     current_user: CurrentUserDep,
+    cursor: str | None = Query(None, description="Keyset cursor from a previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of subscriptions to return"),
 ):
-    """List all subscriptions in a mosaic
+    """List subscriptions in a mosaic, one keyset page at a time
 
     Business logic:
-    1. Query all subscriptions WHERE mosaic_id=X AND user_id=Y AND deleted_at IS NULL
-    2. Order by created_at DESC (newest first)
-    3. Return list of subscriptions (empty list if none)
+    1. Query subscriptions WHERE mosaic_id=X AND user_id=Y AND deleted_at IS NULL
+    2. Order by created_at DESC, id DESC (newest first)
+    3. Continue after the cursor if given: WHERE (created_at, id) < cursor
+    4. Stream at most limit subscriptions as JSON, with next_cursor set if more exist
+
+    Validation Rules:
+    - limit must be between 1 and 500
 
     Note: This endpoint does not verify if the mosaic exists. If mosaic doesn't exist
     or doesn't belong to user, it simply returns an empty list.
 
+    The body is streamed from a server-side cursor in batches. It has the
+    same shape as SuccessResponse[PaginatedData[SubscriptionOut]] (total and
+    total_pages are null, page is always 1).
+
     Raises:
-        (No exceptions raised - returns empty list if no subscriptions found)
+        ValidationError: If the cursor is malformed
     """
-    logger.info(f"Listing subscriptions: mosaic_id={mosaic_id}, user_id={current_user.id}")
+    logger.debug(
+        "Listing subscriptions: mosaic_id=%s, user_id=%s, cursor=%s, limit=%s",
+        mosaic_id, current_user.id, cursor, limit
+    )
 
-    # Query all subscriptions for this mosaic and user
-    stmt = select(Subscription).where(
+    # 1-2. Query subscriptions for this mosaic and user (response columns only)
+    stmt = select(*_SUBSCRIPTION_OUT_COLUMNS).where(
         Subscription.mosaic_id == mosaic_id,
         Subscription.user_id == current_user.id,
         Subscription.deleted_at.is_(None)
-    ).order_by(Subscription.created_at.desc())
-
-    result = await session.execute(stmt)
-    subscriptions = result.scalars().all()
-
-    logger.debug(
-        f"Found {len(subscriptions)} subscriptions: mosaic_id={mosaic_id}, user_id={current_user.id}"
+    ).order_by(
+        Subscription.created_at.desc(),
+        Subscription.id.desc()
     )
 
-    # Build response list
-    subscription_list = [
-        SubscriptionOut(
-            id=sub.id,
-            user_id=sub.user_id,
-            mosaic_id=sub.mosaic_id,
-            connection_id=sub.connection_id,
-            source_node_id=sub.source_node_id,
-            target_node_id=sub.target_node_id,
-            event_type=sub.event_type,
-            description=sub.description,
-            created_at=sub.created_at,
-            updated_at=sub.updated_at
+    # 3. Continue after the cursor (fetch one extra row to detect a next page)
+    if cursor is not None:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Subscription.created_at, Subscription.id)
+            < tuple_(cursor_created_at, cursor_id)
         )
-        for sub in subscriptions
-    ]
-
-    logger.info(
-        f"Listed {len(subscription_list)} subscriptions: mosaic_id={mosaic_id}, user_id={current_user.id}"
+    stmt = stmt.limit(limit + 1)
+
+    # 4. Stream the page on a dedicated session: the response body is produced
+    # after the endpoint returns, so the request-scoped session can't be used.
+    # A Response instance also bypasses FastAPI's response_model re-validation
+    # (response_model still documents the shape).
+    return StreamingResponse(
+        _stream_subscriptions(
+            req.app.state.async_session_factory, stmt, limit, mosaic_id, current_user.id
+        ),
+        media_type="application/json"
     )
-    return SuccessResponse(data=subscription_list)
 
 
 @router.get("/{subscription_id}", response_model=SuccessResponse[SubscriptionOut])
@@ -259,7 +334,8 @@ async def get_subscription(
         NotFoundError: If subscription not found or doesn't belong to specified mosaic/user
     """
     logger.info(
-        f"Getting subscription: id={subscription_id}, mosaic_id={mosaic_id}, user_id={current_user.id}"
+        "Getting subscription: id=%s, mosaic_id=%s, user_id=%s",
+        subscription_id, mosaic_id, current_user.id
     )
 
     # Query subscription by ID with mosaic_id and user_id verification
@@ -274,26 +350,16 @@ async def get_subscription(
 
     if not subscription:
         logger.warning(
-            f"Subscription not found: id={subscription_id}, mosaic_id={mosaic_id}, "
-            f"user_id={current_user.id}"
+            "Subscription not found: id=%s, mosaic_id=%s, "
+            "user_id=%s",
+            subscription_id, mosaic_id, current_user.id
         )
         raise NotFoundError("Subscription not found")
 
     # Construct response
-    subscription_out = SubscriptionOut(
-        id=subscription.id,
-        user_id=subscription.user_id,
-        mosaic_id=subscription.mosaic_id,
-        connection_id=subscription.connection_id,
-        source_node_id=subscription.source_node_id,
-        target_node_id=subscription.target_node_id,
-        event_type=subscription.event_type,
-        description=subscription.description,
-        created_at=subscription.created_at,
-        updated_at=subscription.updated_at
-    )
+    subscription_out = SubscriptionOut.model_validate(subscription)
 
-    logger.info(f"Subscription retrieved successfully: id={subscription_id}")
+    logger.info("Subscription retrieved successfully: id=%s", subscription_id)
     return SuccessResponse(data=subscription_out)
 
 
@@ -305,17 +371,17 @@ async def update_subscription(
     req: Request,
     session: SessionDep,
     current_user: CurrentUserDep,
+    mosaic: OwnedMosaicDep,
 ):
     """Update a subscription
 
     Business logic:
     1. Validate request: description must be provided
-    2. Query mosaic and verify ownership
+    2. Resolve mosaic and verify ownership (OwnedMosaicDep)
     3. Verify mosaic is stopped (cannot modify running mosaic)
-    4. Query subscription and verify ownership
-    5. Update description field
-    6. Update updated_at timestamp
-    7. Return updated subscription
+    4. Set description and updated_at with a single UPDATE ... RETURNING
+       restricted to the user's live subscription (no row means not found)
+    5. Return updated subscription
 
     Note: Only description can be updated. Core fields (connection_id, source_node_id,
     target_node_id, event_type) are immutable.
@@ -331,79 +397,52 @@ async def update_subscription(
         PermissionError: If mosaic or subscription doesn't belong to current user
     """
     logger.info(
-        f"Updating subscription: id={subscription_id}, mosaic_id={mosaic_id}, "
-        f"user_id={current_user.id}"
+        "Updating subscription: id=%s, mosaic_id=%s, "
+        "user_id=%s",
+        subscription_id, mosaic_id, current_user.id
     )
 
     # 1. Validate request: description must be provided
     if request.description is None:
         raise ValidationError("Description field must be provided for update")
 
-    # 2. Query mosaic and verify ownership
-    mosaic_stmt = select(Mosaic).where(
-        Mosaic.id == mosaic_id,
-        Mosaic.deleted_at.is_(None)
-    )
-    mosaic_result = await session.execute(mosaic_stmt)
-    mosaic = mosaic_result.scalar_one_or_none()
-
-    if not mosaic:
-        logger.warning(f"Mosaic not found: id={mosaic_id}")
-        raise NotFoundError("Mosaic not found")
-
-    if mosaic.user_id != current_user.id:
-        logger.warning(
-            f"Permission denied: mosaic_id={mosaic_id}, "
-            f"owner_id={mosaic.user_id}, requester_id={current_user.id}"
-        )
-        raise PermissionError("You do not have permission to modify this mosaic")
+    # 2. Mosaic existence and ownership are verified by OwnedMosaicDep
 
     # 3. Verify mosaic is stopped
     runtime_manager = req.app.state.runtime_manager
     status = await runtime_manager.get_mosaic_status(mosaic)
     if status == MosaicStatus.RUNNING:
-        logger.warning(f"Cannot modify running mosaic: id={mosaic_id}")
+        logger.warning("Cannot modify running mosaic: id=%s", mosaic_id)
         raise ValidationError("Cannot update subscription in running mosaic. Please stop it first.")
 
-    # 4. Query subscription and verify ownership
-    stmt = select(Subscription).where(
+    # 4. Update description and updated_at in one conditional UPDATE
+    #    (matches only an owned, live subscription)
+    stmt = update(Subscription).where(
         Subscription.id == subscription_id,
         Subscription.mosaic_id == mosaic_id,
         Subscription.user_id == current_user.id,
         Subscription.deleted_at.is_(None)
-    )
+    ).values(
+        description=request.description,
+        updated_at=datetime.now()
+    ).returning(Subscription)
     result = await session.execute(stmt)
     subscription = result.scalar_one_or_none()
 
     if not subscription:
         logger.warning(
-            f"Subscription not found: id={subscription_id}, mosaic_id={mosaic_id}, "
-            f"user_id={current_user.id}"
+            "Subscription not found: id=%s, mosaic_id=%s, "
+            "user_id=%s",
+            subscription_id, mosaic_id, current_user.id
         )
         raise NotFoundError("Subscription not found")
 
-    # 5. Update description
-    subscription.description = request.description
-    logger.debug(f"Subscription description updated: id={subscription_id}")
-
-    # 6. Update the updated_at timestamp
-    subscription.updated_at = datetime.now()
-
-    # 7. Construct response
-    subscription_out = SubscriptionOut(
-        id=subscription.id,
-        user_id=subscription.user_id,
-        mosaic_id=subscription.mosaic_id,
-        connection_id=subscription.connection_id,
-        source_node_id=subscription.source_node_id,
-        target_node_id=subscription.target_node_id,
-        event_type=subscription.event_type,
-        description=subscription.description,
-        created_at=subscription.created_at,
-        updated_at=subscription.updated_at
-    )
+    logger.debug("Subscription description updated: id=%s", subscription_id)
+
+    # 5. Construct response
+    subscription_out = SubscriptionOut.model_validate(subscription)
 
-    logger.info(f"Subscription updated successfully: id={subscription_id}")
+    logger.info("Subscription updated successfully: id=%s", subscription_id)
     return SuccessResponse(data=subscription_out)
 
 
@@ -414,15 +453,16 @@ async def delete_subscription(
     req: Request,
     session: SessionDep,
     current_user: CurrentUserDep,
+    mosaic: OwnedMosaicDep,
 ):
     """Delete a subscription (soft delete)
 
     Business logic:
-    1. Query mosaic and verify ownership
+    1. Resolve mosaic and verify ownership (OwnedMosaicDep)
     2. Verify mosaic is stopped (cannot modify running mosaic)
-    3. Query subscription and verify ownership
-    4. Set deleted_at = datetime.now() (soft delete)
-    5. Commit and return success
+    3. Set deleted_at = datetime.now() with a single UPDATE ... RETURNING
+       restricted to the user's live subscription (no row means not found)
+    4. Commit and return success
 
     Note:
     - This is a soft delete operation (sets deleted_at timestamp)
@@ -435,56 +475,40 @@ async def delete_subscription(
         ValidationError: If mosaic is running
     """
     logger.info(
-        f"Deleting subscription: id={subscription_id}, mosaic_id={mosaic_id}, "
-        f"user_id={current_user.id}"
+        "Deleting subscription: id=%s, mosaic_id=%s, "
+        "user_id=%s",
+        subscription_id, mosaic_id, current_user.id
     )
 
-    # 1. Query mosaic and verify ownership
-    mosaic_stmt = select(Mosaic).where(
-        Mosaic.id == mosaic_id,
-        Mosaic.deleted_at.is_(None)
-    )
-    mosaic_result = await session.execute(mosaic_stmt)
-    mosaic = mosaic_result.scalar_one_or_none()
-
-    if not mosaic:
-        logger.warning(f"Mosaic not found: id={mosaic_id}")
-        raise NotFoundError("Mosaic not found")
-
-    if mosaic.user_id != current_user.id:
-        logger.warning(
-            f"Permission denied: mosaic_id={mosaic_id}, "
-            f"owner_id={mosaic.user_id}, requester_id={current_user.id}"
-        )
-        raise PermissionError("You do not have permission to delete subscriptions in this mosaic")
+    # 1. Mosaic existence and ownership are verified by OwnedMosaicDep
 
     # 2. Verify mosaic is stopped
     runtime_manager = req.app.state.runtime_manager
     status = await runtime_manager.get_mosaic_status(mosaic)
     if status == MosaicStatus.RUNNING:
-        logger.warning(f"Cannot modify running mosaic: id={mosaic_id}")
+        logger.warning("Cannot modify running mosaic: id=%s", mosaic_id)
         raise ValidationError("Cannot delete subscription in running mosaic. Please stop it first.")
 
-    # 3. Query subscription and verify ownership
-    stmt = select(Subscription).where(
+    # 3. Soft delete in one conditional UPDATE (matches only an owned, live subscription)
+    stmt = update(Subscription).where(
         Subscription.id == subscription_id,
         Subscription.mosaic_id == mosaic_id,
         Subscription.user_id == current_user.id,
         Subscription.deleted_at.is_(None)
-    )
+    ).values(
+        deleted_at=datetime.now()
+    ).returning(Subscription.id).execution_options(synchronize_session=False)
     result = await session.execute(stmt)
-    subscription = result.scalar_one_or_none()
 
-    if not subscription:
+    if result.scalar_one_or_none() is None:
         logger.warning(
-            f"Subscription not found: id={subscription_id}, mosaic_id={mosaic_id}, "
-            f"user_id={current_user.id}"
+            "Subscription not found: id=%s, mosaic_id=%s, "
+            "user_id=%s",
+            subscription_id, mosaic_id, current_user.id
         )
         raise NotFoundError("Subscription not found")
 
-    # 4. Soft delete (set deleted_at)
-    subscription.deleted_at = datetime.now()
-    logger.debug(f"Subscription soft deleted: id={subscription_id}")
+    logger.debug("Subscription soft deleted: id=%s", subscription_id)
 
-    logger.info(f"Subscription deleted successfully: id={subscription_id}")
+    logger.info("Subscription deleted successfully: id=%s", subscription_id)
     return SuccessResponse(data=None)
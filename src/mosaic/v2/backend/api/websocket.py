@@ -1,18 +1,306 @@
 """WebSocket API for session interaction"""
 
+import asyncio
 import logging
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, TYPE_CHECKING
+
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from sqlalchemy import select
+from sqlalchemy import select, and_, bindparam
 
 from ..model import Session
-from ..security import verify_token_and_get_user
+from ..model.node import Node
+from ..security import verify_token_and_get_user, get_token_expiry
+from ..cache import TTLCache, get_cached_token_user, cache_token_user
 from ..exception import AuthenticationError
 
+if TYPE_CHECKING:
+    from ..runtime.manager import RuntimeManager
+
 logger = logging.getLogger(__name__)
 
+# Per-connection cache of verified (session, node) pairs: a session's owner
+# and node never change, so repeat messages skip the lookup; the TTL bounds
+# how long a deleted node or session keeps being served
+_SESSION_CACHE_MAXSIZE = 32
+_SESSION_CACHE_TTL = 30.0
+
+# Session plus its live node (node is None when missing or soft-deleted), built
+# once so each lookup only binds session_id
+_SESSION_WITH_NODE_STMT = select(Session, Node).outerjoin(
+    Node,
+    and_(
+        Node.mosaic_id == Session.mosaic_id,
+        Node.node_id == Session.node_id,
+        Node.deleted_at.is_(None)
+    )
+).where(Session.session_id == bindparam("session_id"))
+
+# Upper bound on how long terminal_start may hold up the receive loop
+_TERMINAL_START_TIMEOUT = 10.0
+
+# Strong references to fire-and-forget control tasks (the event loop only
+# keeps weak ones), dropped once each task finishes
+_background_tasks: set[asyncio.Task] = set()
+
 router = APIRouter(tags=["WebSocket"])
 
 
+# ==================== Frame Helpers ====================
+# Frames are decoded with orjson instead of Starlette's stdlib-json
+# receive_json(). Replies are not sent inline: they are queued on the
+# connection's UserMessageBroker queue, whose forwarding task encodes and
+# sends them, so the receive loop never waits on a send and that task stays
+# the only writer to the socket.
+
+
+async def _receive_json(websocket: WebSocket) -> Any:
+    """Receive one text or binary frame and decode it as JSON
+
+    Raises:
+        WebSocketDisconnect: If the client disconnected
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    raw = message.get("text")
+    if raw is None:
+        raw = message.get("bytes")
+    return orjson.loads(raw)
+
+
+def _send_error(send: Callable[[Any], None], session_id: str, message: str) -> None:
+    """Queue an error frame for a session
+
+    Args:
+        send: Connection's frame sender (see HandlerContext.send)
+        session_id: Session the error refers to
+        message: Error description
+    """
+    send({
+        "session_id": session_id,
+        "type": "error",
+        "message": message
+    })
+
+
+# Static error frames, encoded once at import
+_ERR_MISSING_SESSION_ID = orjson.dumps({
+    "type": "error",
+    "message": "Missing session_id in message"
+}).decode()
+
+
+# ==================== Background Tasks ====================
+
+
+def _run_in_background(coro: Awaitable[None], description: str) -> None:
+    """Run a best-effort control operation without blocking the receive loop
+
+    Failures are logged, never reported to the client.
+
+    Args:
+        coro: Coroutine to run
+        description: Operation description used in the failure log
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+
+    def _on_done(done: asyncio.Task) -> None:
+        _background_tasks.discard(done)
+        if not done.cancelled() and done.exception() is not None:
+            logger.error(
+                "Failed to %s: %s",
+                description, done.exception(), exc_info=done.exception()
+            )
+
+    task.add_done_callback(_on_done)
+
+
+# ==================== Message Handlers ====================
+
+
+@dataclass
+class HandlerContext:
+    """
+    Per-message state passed to message handlers.
+
+    Attributes:
+        websocket: Client WebSocket connection
+        send: Queues a reply frame (dict, or pre-encoded JSON str) on this connection
+        runtime_manager: RuntimeManager singleton
+        user_id: Authenticated user's ID
+        user_dir: User's directory under the instance (instance/users/<user_id>)
+        session_id: Target session ID from the message
+        session: Verified session (owned by user_id)
+        node: Live node the session runs on
+    """
+    websocket: WebSocket
+    send: Callable[[Any], None]
+    runtime_manager: "RuntimeManager"
+    user_id: int
+    user_dir: Path
+    session_id: str
+    session: Session
+    node: Node
+
+
+async def _handle_user_message(ctx: HandlerContext, data: dict) -> None:
+    """Submit a user message to the session (non-blocking)"""
+    user_message = data.get("message")
+    if not user_message:
+        _send_error(ctx.send, ctx.session_id, "Missing message content")
+        return
+
+    # Extract optional context (e.g., GeoGebra states)
+    context = data.get("context")
+
+    # Submit command to RuntimeManager (non-blocking)
+    try:
+        ctx.runtime_manager.submit_send_message(
+            node=ctx.node,
+            session=ctx.session,
+            message=user_message,
+            context=context
+        )
+        logger.debug(
+            "User message submitted: session_id=%s, "
+            "user_id=%s, message_length=%s",
+            ctx.session_id, ctx.user_id, len(user_message)
+        )
+    except Exception as e:
+        logger.error("Failed to submit message: %s", e, exc_info=True)
+        _send_error(ctx.send, ctx.session_id, f"Failed to send message: {str(e)}")
+
+
+async def _handle_interrupt(ctx: HandlerContext, data: dict) -> None:
+    """Interrupt the session's current turn (bounded by interrupt_session's own timeout)"""
+    try:
+        await ctx.runtime_manager.interrupt_session(node=ctx.node, session=ctx.session)
+        logger.info("Session interrupted: session_id=%s", ctx.session_id)
+    except Exception as e:
+        logger.error("Failed to interrupt session: %s", e, exc_info=True)
+        _send_error(ctx.send, ctx.session_id, f"Failed to interrupt: {str(e)}")
+
+
+async def _handle_terminal_start(ctx: HandlerContext, data: dict) -> None:
+    """Start a terminal in the node's workspace"""
+    try:
+        # Build workspace path
+        workspace_path = ctx.user_dir / str(ctx.node.mosaic_id) / str(ctx.node.id)
+
+        await asyncio.wait_for(
+            ctx.runtime_manager.start_terminal(
+                node=ctx.node,
+                session=ctx.session,
+                user_id=ctx.user_id,
+                workspace_path=workspace_path
+            ),
+            timeout=_TERMINAL_START_TIMEOUT
+        )
+        logger.info("Terminal started: session_id=%s", ctx.session_id)
+    except asyncio.TimeoutError:
+        logger.error(
+            "Terminal start timed out after %ss: session_id=%s",
+            _TERMINAL_START_TIMEOUT, ctx.session_id
+        )
+        _send_error(ctx.send, ctx.session_id, "Failed to start terminal: timed out")
+    except Exception as e:
+        logger.error("Failed to start terminal: %s", e, exc_info=True)
+        _send_error(ctx.send, ctx.session_id, f"Failed to start terminal: {str(e)}")
+
+
+async def _handle_terminal_input(ctx: HandlerContext, data: dict) -> None:
+    """Forward input to the session's terminal"""
+    terminal_data = data.get("data")
+    if terminal_data is None:
+        _send_error(ctx.send, ctx.session_id, "Missing terminal data")
+        return
+
+    try:
+        await ctx.runtime_manager.send_terminal_input(
+            session=ctx.session,
+            data=terminal_data
+        )
+    except Exception as e:
+        logger.error("Failed to send terminal input: %s", e, exc_info=True)
+        _send_error(ctx.send, ctx.session_id, f"Failed to send terminal input: {str(e)}")
+
+
+async def _handle_terminal_resize(ctx: HandlerContext, data: dict) -> None:
+    """Resize the session's terminal"""
+    cols = data.get("cols")
+    rows = data.get("rows")
+    if cols is None or rows is None:
+        _send_error(ctx.send, ctx.session_id, "Missing cols or rows")
+        return
+
+    # Best-effort, so don't block the receive loop on it
+    # (failures are logged, not sent to the client)
+    _run_in_background(
+        ctx.runtime_manager.resize_terminal(
+            session=ctx.session,
+            cols=cols,
+            rows=rows
+        ),
+        "resize terminal"
+    )
+
+
+async def _handle_terminal_stop(ctx: HandlerContext, data: dict) -> None:
+    """Stop the session's terminal"""
+    # Best-effort, so don't block the receive loop on it
+    # (failures are logged, not sent to the client: the session may be closing)
+    _run_in_background(
+        ctx.runtime_manager.stop_terminal(session=ctx.session),
+        "stop terminal"
+    )
+    logger.info("Terminal stop requested: session_id=%s", ctx.session_id)
+
+
+async def _handle_tool_response(ctx: HandlerContext, data: dict) -> None:
+    """Handle a tool response from the frontend (e.g., GeoGebra execution result)"""
+    response_id = data.get("response_id")
+    result = data.get("result")
+
+    if not response_id:
+        _send_error(ctx.send, ctx.session_id, "Missing response_id in tool_response")
+        return
+
+    # Submit tool response handling (non-blocking)
+    try:
+        ctx.runtime_manager.submit_tool_response(
+            node=ctx.node,
+            session=ctx.session,
+            response_id=response_id,
+            result=result
+        )
+        logger.debug(
+            "Tool response submitted: session_id=%s, response_id=%s",
+            ctx.session_id, response_id
+        )
+    except Exception as e:
+        logger.error("Failed to submit tool response: %s", e, exc_info=True)
+        _send_error(ctx.send, ctx.session_id, f"Failed to handle tool response: {str(e)}")
+
+
+# Client message type -> handler
+HANDLERS: dict[str, Callable[[HandlerContext, dict], Awaitable[None]]] = {
+    "user_message": _handle_user_message,
+    "interrupt": _handle_interrupt,
+    "terminal_start": _handle_terminal_start,
+    "terminal_input": _handle_terminal_input,
+    "terminal_resize": _handle_terminal_resize,
+    "terminal_stop": _handle_terminal_stop,
+    "tool_response": _handle_tool_response,
+}
+
+
+# ==================== WebSocket Endpoint ====================
+
 @router.websocket("/ws/user")
 async def websocket_user_endpoint(
     websocket: WebSocket,
@@ -69,271 +357,131 @@ async def websocket_user_endpoint(
     runtime_manager = websocket.app.state.runtime_manager
     jwt_config = websocket.app.state.config.get("jwt", {})
 
-    # 2. Verify token and get user
+    # 2. Verify token and get user (a token verified within the last 30s skips
+    #    the JWT decode and the user lookup, e.g. during reconnect storms)
     try:
-        # Verify token (reuse shared logic from security module)
-        async with async_session_factory() as session:
-            current_user = await verify_token_and_get_user(token, jwt_config, session)
+        current_user = get_cached_token_user(token)
+        if current_user is None:
+            # Verify token (reuse shared logic from security module)
+            async with async_session_factory() as session:
+                current_user = await verify_token_and_get_user(token, jwt_config, session)
+            cache_token_user(token, current_user, get_token_expiry(token))
     except AuthenticationError as e:
-        logger.warning(f"WebSocket auth failed: {e.message}")
+        logger.warning("WebSocket auth failed: %s", e.message)
         await websocket.close(code=4401, reason="Unauthorized")
         return
     except Exception as e:
-        logger.error(f"WebSocket auth error: {e}", exc_info=True)
+        logger.error("WebSocket auth error: %s", e, exc_info=True)
         await websocket.close(code=4500, reason="Internal error")
         return
 
     # 3. Accept WebSocket connection
     await websocket.accept()
-    logger.info(f"User WebSocket accepted for user {current_user.id} ({current_user.email})")
+    logger.info("User WebSocket accepted for user %s (%s)", current_user.id, current_user.email)
 
     # 4. Register connection in UserMessageBroker
     await user_message_broker.connect_user(current_user.id, websocket)
 
+    # User directory, constant for the connection (terminal workspaces live under it)
+    user_dir = websocket.app.state.instance_path / "users" / str(current_user.id)
+
+    # Reply frames go through the connection's broker queue
+    send = partial(user_message_broker.send_to_connection, current_user.id, websocket)
+
+    # Verified (session, node) pairs for this connection, keyed by session_id
+    session_cache = TTLCache(maxsize=_SESSION_CACHE_MAXSIZE, ttl=_SESSION_CACHE_TTL)
+
+    # One ORM session reused for every lookup on this connection; it is closed
+    # after each lookup, which returns the pooled connection and detaches the
+    # loaded rows, so no connection is held while the socket is idle
+    db_session = async_session_factory()
+
     try:
         # 5. Receive messages from WebSocket and route to sessions
         while True:
             try:
-                data = await websocket.receive_json()
+                data = await _receive_json(websocket)
             except WebSocketDisconnect:
-                logger.info(f"User {current_user.id} WebSocket disconnected normally")
+                logger.info("User %s WebSocket disconnected normally", current_user.id)
                 break
             except Exception as e:
-                logger.error(f"Error receiving WebSocket message: {e}", exc_info=True)
+                logger.error("Error receiving WebSocket message: %s", e, exc_info=True)
                 break
 
             session_id = data.get("session_id")
             message_type = data.get("type")
 
             if not session_id:
-                logger.warning(f"Message missing session_id from user {current_user.id}: {data}")
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Missing session_id in message"
-                })
+                logger.warning("Message missing session_id from user %s: %s", current_user.id, data)
+                send(_ERR_MISSING_SESSION_ID)
                 continue
 
             # Verify session ownership and status
-            try:
-                async with async_session_factory() as db_session:
-                    stmt = select(Session).where(Session.session_id == session_id)
-                    result = await db_session.execute(stmt)
-                    session = result.scalar_one_or_none()
-
-                    if not session:
-                        await websocket.send_json({
-                            "session_id": session_id,
-                            "type": "error",
-                            "message": "Session not found"
-                        })
-                        continue
-
-                    if session.user_id != current_user.id:
-                        await websocket.send_json({
-                            "session_id": session_id,
-                            "type": "error",
-                            "message": "Forbidden: session does not belong to user"
-                        })
-                        continue
-
-                    # Get node information (exclude soft-deleted nodes)
-                    from ..model.node import Node
-                    stmt = select(Node).where(
-                        Node.mosaic_id == session.mosaic_id,
-                        Node.node_id == session.node_id,
-                        Node.deleted_at.is_(None)
-                    )
-                    result = await db_session.execute(stmt)
-                    node = result.scalar_one_or_none()
-
-                    if not node:
-                        await websocket.send_json({
-                            "session_id": session_id,
-                            "type": "error",
-                            "message": "Node not found or deleted"
-                        })
-                        continue
-
-            except Exception as e:
-                logger.error(f"Failed to verify session {session_id}: {e}", exc_info=True)
-                await websocket.send_json({
-                    "session_id": session_id,
-                    "type": "error",
-                    "message": "Internal error verifying session"
-                })
-                continue
-
-            # Route message based on type
-            if message_type == "user_message":
-                user_message = data.get("message")
-                if not user_message:
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": "Missing message content"
-                    })
-                    continue
-
-                # Extract optional context (e.g., GeoGebra states)
-                context = data.get("context")
-
-                # Submit command to RuntimeManager (non-blocking)
-                try:
-                    runtime_manager.submit_send_message(
-                        node=node,
-                        session=session,
-                        message=user_message,
-                        context=context
-                    )
-                    logger.debug(
-                        f"User message submitted: session_id={session_id}, "
-                        f"user_id={current_user.id}, message_length={len(user_message)}"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to submit message: {e}", exc_info=True)
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": f"Failed to send message: {str(e)}"
-                    })
-
-            elif message_type == "interrupt":
-                # Submit interrupt command
-                try:
-                    await runtime_manager.interrupt_session(node=node, session=session)
-                    logger.info(f"Session interrupted: session_id={session_id}")
-                except Exception as e:
-                    logger.error(f"Failed to interrupt session: {e}", exc_info=True)
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": f"Failed to interrupt: {str(e)}"
-                    })
-
-            elif message_type == "terminal_start":
-                # Start terminal session
+            # (served from the per-connection cache when recently verified;
+            # otherwise session and node are fetched in one round-trip, the
+            # outer join yielding node=None when the node is missing or deleted)
+            cached = session_cache.get(session_id)
+            if cached is not None:
+                session, node = cached
+            else:
                 try:
-                    # Build workspace path
-                    instance_path = websocket.app.state.instance_path
-                    workspace_path = instance_path / "users" / str(current_user.id) / str(node.mosaic_id) / str(node.id)
-
-                    await runtime_manager.start_terminal(
-                        node=node,
-                        session=session,
-                        user_id=current_user.id,
-                        workspace_path=workspace_path
-                    )
-                    logger.info(f"Terminal started: session_id={session_id}")
+                    try:
+                        result = await db_session.execute(
+                            _SESSION_WITH_NODE_STMT, {"session_id": session_id}
+                        )
+                        row = result.one_or_none()
+                    finally:
+                        await db_session.close()
                 except Exception as e:
-                    logger.error(f"Failed to start terminal: {e}", exc_info=True)
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": f"Failed to start terminal: {str(e)}"
-                    })
-
-            elif message_type == "terminal_input":
-                # Send terminal input
-                terminal_data = data.get("data")
-                if terminal_data is None:
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": "Missing terminal data"
-                    })
+                    logger.error("Failed to verify session %s: %s", session_id, e, exc_info=True)
+                    _send_error(send, session_id, "Internal error verifying session")
                     continue
 
-                try:
-                    await runtime_manager.send_terminal_input(
-                        session=session,
-                        data=terminal_data
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send terminal input: {e}", exc_info=True)
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": f"Failed to send terminal input: {str(e)}"
-                    })
-
-            elif message_type == "terminal_resize":
-                # Resize terminal
-                cols = data.get("cols")
-                rows = data.get("rows")
-                if cols is None or rows is None:
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": "Missing cols or rows"
-                    })
+                if row is None:
+                    _send_error(send, session_id, "Session not found")
                     continue
 
-                try:
-                    await runtime_manager.resize_terminal(
-                        session=session,
-                        cols=cols,
-                        rows=rows
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to resize terminal: {e}", exc_info=True)
-                    # Don't send error to client for resize failures (non-critical)
+                session, node = row
 
-            elif message_type == "terminal_stop":
-                # Stop terminal
-                try:
-                    await runtime_manager.stop_terminal(session=session)
-                    logger.info(f"Terminal stopped: session_id={session_id}")
-                except Exception as e:
-                    logger.error(f"Failed to stop terminal: {e}", exc_info=True)
-                    # Don't send error to client for stop failures (session may be closing)
-
-            elif message_type == "tool_response":
-                # Handle tool response from frontend (e.g., GeoGebra execution result)
-                response_id = data.get("response_id")
-                result = data.get("result")
-
-                if not response_id:
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": "Missing response_id in tool_response"
-                    })
+                if session.user_id != current_user.id:
+                    _send_error(send, session_id, "Forbidden: session does not belong to user")
                     continue
 
-                # Submit tool response handling (non-blocking)
-                try:
-                    runtime_manager.submit_tool_response(
-                        node=node,
-                        session=session,
-                        response_id=response_id,
-                        result=result
-                    )
-                    logger.debug(
-                        f"Tool response submitted: session_id={session_id}, "
-                        f"response_id={response_id}"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to submit tool response: {e}", exc_info=True)
-                    await websocket.send_json({
-                        "session_id": session_id,
-                        "type": "error",
-                        "message": f"Failed to handle tool response: {str(e)}"
-                    })
+                if not node:
+                    _send_error(send, session_id, "Node not found or deleted")
+                    continue
 
-            else:
-                logger.warning(f"Unknown message type from user {current_user.id}: {message_type}")
-                await websocket.send_json({
-                    "session_id": session_id,
-                    "type": "error",
-                    "message": f"Unknown message type: {message_type}"
-                })
+                session_cache.set(session_id, (session, node))
+
+            # Route message to its handler
+            handler = HANDLERS.get(message_type)
+            if handler is None:
+                logger.warning(
+                    "Unknown message type from user %s: %s",
+                    current_user.id, message_type
+                )
+                _send_error(send, session_id, f"Unknown message type: {message_type}")
+                continue
+
+            ctx = HandlerContext(
+                websocket=websocket,
+                send=send,
+                runtime_manager=runtime_manager,
+                user_id=current_user.id,
+                user_dir=user_dir,
+                session_id=session_id,
+                session=session,
+                node=node
+            )
+            await handler(ctx, data)
 
     except Exception as e:
         logger.error(
-            f"Unexpected error in WebSocket connection for user {current_user.id}: {e}",
-            exc_info=True
+            "Unexpected error in WebSocket connection for user %s: %s",
+            current_user.id, e, exc_info=True
         )
     finally:
-        # 6. Cleanup: Disconnect from UserMessageBroker
+        # 6. Cleanup: Disconnect from UserMessageBroker and release the DB session
         await user_message_broker.disconnect_user(current_user.id, websocket)
-        logger.info(f"User {current_user.id} WebSocket connection closed")
+        await db_session.close()
+        logger.info("User %s WebSocket connection closed", current_user.id)
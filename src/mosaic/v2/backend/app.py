@@ -5,15 +5,14 @@ from pathlib import Path
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .logging import setup_logging
 from .exception import MosaicException
-from .schema.response import ErrorResponse
 from .api import (
     auth_router,
     mosaic_router,
@@ -25,7 +24,8 @@ from .api import (
     session_routing_router,
     message_router,
     image_router,
-    programmable_router
+    programmable_router,
+    health_router
 )
 from .api.websocket import router as websocket_router
 from .runtime.manager import RuntimeManager
@@ -34,6 +34,128 @@ from .code_server.manager import CodeServerManager
 
 logger = logging.getLogger(__name__)
 
+# Fields required in the [cors] config section (there are no defaults)
+CORS_CONFIG_FIELDS = ("allow_origins", "allow_credentials", "allow_methods", "allow_headers")
+
+
+def _error_payload(message: str, error: dict) -> dict:
+    """Build an ErrorResponse-shaped body as a plain dict
+
+    Same keys as ErrorResponse(...).model_dump(), without constructing and
+    validating a Pydantic model for every error response.
+    """
+    return {"success": False, "message": message, "data": None, "error": error}
+
+
+# Constant body of the fallback error response, built once
+_INTERNAL_ERROR_PAYLOAD = _error_payload(
+    "An unexpected error occurred. Please try again later.",
+    {"code": "INTERNAL_ERROR"}
+)
+
+
+# ==================== Exception Handlers ====================
+
+# Keys kept from each validation error: "input" can be a large request body
+# and "ctx" may hold exception objects that cannot be JSON-encoded
+_VALIDATION_ERROR_KEYS = ("type", "loc", "msg")
+
+
+async def mosaic_exception_handler(request: Request, exc: MosaicException) -> ORJSONResponse:
+    """Handle all Mosaic business exceptions
+
+    All custom exceptions (ValidationError, ConflictError, etc.) inherit from MosaicException.
+    This handler catches them and returns a unified ErrorResponse format.
+
+    Args:
+        request: The incoming request
+        exc: The Mosaic exception instance
+
+    Returns:
+        ORJSONResponse with ErrorResponse format (HTTP 200, success=false)
+    """
+    # Log business exception
+    logger.warning(
+        "Business exception in %s %s: [%s] %s",
+        request.method, request.url.path, exc.code, exc.message
+    )
+
+    return ORJSONResponse(
+        status_code=200,  # Business errors return 200 with success=false
+        content=_error_payload(exc.message, {"code": exc.code})
+    )
+
+
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
+    """Handle Pydantic validation errors
+
+    This catches errors from FastAPI's automatic request validation
+    (e.g., invalid email format, missing required fields, type mismatches).
+
+    Args:
+        request: The incoming request
+        exc: The validation error instance
+
+    Returns:
+        ORJSONResponse with ErrorResponse format (HTTP 200, success=false)
+    """
+    errors = [
+        {key: error[key] for key in _VALIDATION_ERROR_KEYS if key in error}
+        for error in exc.errors()
+    ]
+
+    # Log validation error with error details
+    logger.warning(
+        "Validation error in %s %s: %s",
+        request.method, request.url.path, errors
+    )
+
+    return ORJSONResponse(
+        status_code=200,  # Validation errors also return 200 with success=false
+        content=_error_payload(
+            "Invalid input format",
+            {
+                "code": "VALIDATION_ERROR",
+                "details": errors
+            }
+        )
+    )
+
+
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """Handle all uncaught exceptions (fallback handler)
+
+    This is the last-resort exception handler that catches any exception
+    not handled by the specific handlers above. It logs the full error
+    details and returns a generic error response to the client.
+
+    Args:
+        request: The incoming request
+        exc: The exception instance
+
+    Returns:
+        ORJSONResponse with ErrorResponse format (HTTP 200, success=false)
+
+    Note:
+        - Logs full exception details (including traceback) for debugging
+        - Returns generic message to client (don't expose internal details)
+        - This handler is registered AFTER specific handlers so it acts as fallback
+    """
+    # Log full error details for debugging (the traceback is attached via
+    # exc_info and only formatted if the record is emitted)
+    logger.error(
+        "Uncaught exception in %s %s: %s: %s",
+        request.method, request.url.path, exc.__class__.__name__, exc,
+        exc_info=exc
+    )
+
+    # Return generic error to client (don't expose internal details)
+    return ORJSONResponse(
+        status_code=200,  # Keep consistent with other error responses
+        content=_INTERNAL_ERROR_PAYLOAD
+    )
+
+
 def create_app(instance_path: Path, config: dict) -> FastAPI:
     """Create and configure FastAPI application instance
 
@@ -53,13 +175,24 @@ def create_app(instance_path: Path, config: dict) -> FastAPI:
 
     # ==================== Lifespan Context Manager ====================
 
+    def _log_code_server_start_failure(task) -> None:
+        """Log a failed background code-server start (the API keeps serving)"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "Code-server failed to start, /api/health/ready stays not ready: %s",
+                task.exception()
+            )
+
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         """Manage application lifespan (startup and shutdown)"""
         # Startup
-        # 0. Run database preflight checks
-        from .db_init import run_preflight_checks
+        # 0. Bring indexes up to date, run database preflight checks and open
+        #    pooled connections up front
+        from .db_init import ensure_indexes, run_preflight_checks, warm_up_pool
+        await ensure_indexes(app.state.engine)
         await run_preflight_checks(app.state.async_session_factory)
+        await warm_up_pool(app.state.engine)
 
         # 1. Set main event loop for UserMessageBroker
         import asyncio
@@ -68,12 +201,28 @@ def create_app(instance_path: Path, config: dict) -> FastAPI:
         # 2. Start runtime manager
         await app.state.runtime_manager.start()
 
-        # 3. Start code-server manager
-        await app.state.code_server_manager.start()
+        # 3. Start code-server manager in the background: waiting for it to
+        #    become ready (up to 30s) would otherwise hold back the port bind.
+        #    /api/health/ready reports ready once it is running.
+        code_server_task = asyncio.create_task(app.state.code_server_manager.start())
+        code_server_task.add_done_callback(_log_code_server_start_failure)
+
+        app.state.ready = True
 
         yield  # Application is running
 
         # Shutdown
+        app.state.ready = False
+
+        # 0. Abort a code-server start that is still waiting for ready
+        #    (stop() below still terminates the process)
+        if not code_server_task.done():
+            code_server_task.cancel()
+            try:
+                await code_server_task
+            except asyncio.CancelledError:
+                pass
+
         # 1. Disconnect all WebSocket connections
         await app.state.user_message_broker.disconnect_all_users()
 
@@ -87,7 +236,9 @@ def create_app(instance_path: Path, config: dict) -> FastAPI:
     app = FastAPI(
         title="Mosaic API",
         description="Event-driven distributed multi-agent system",
-        lifespan=lifespan
+        lifespan=lifespan,
+        # Encode responses with orjson instead of stdlib json
+        default_response_class=ORJSONResponse
     )
 
     # ==================== Database Configuration ====================
@@ -96,19 +247,37 @@ def create_app(instance_path: Path, config: dict) -> FastAPI:
     db_path = instance_path / "data" / "mosaic.db"
     db_url = f"sqlite+aiosqlite:///{db_path}"
 
+    # Pool settings from the optional [database] section (existing instances
+    # have no such section, so every field falls back to a default). A queue
+    # pool reuses connections, keeping each one's SQLite page cache warm.
+    database_config = config.get('database', {})
+
     engine = create_async_engine(
         db_url,
-        echo=False,
-        future=True,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=database_config.get('pool_size', 20),
+        max_overflow=database_config.get('max_overflow', 10),
+        pool_pre_ping=True,
+        pool_recycle=database_config.get('pool_recycle', 300),
+        # Compiled SQL cache (default 500); sized for the prebuilt statements,
+        # lambda statements and their filter variants shared across endpoints
+        query_cache_size=1200,
+        # SQLite busy timeout in seconds: writers wait out locks held by other
+        # writers or WAL checkpoints instead of failing with "database is locked"
+        connect_args={"timeout": database_config.get('busy_timeout', 30)},
     )
 
+    # Set WAL mode and the other per-connection SQLite pragmas
+    from .db_init import register_sqlite_pragmas
+    register_sqlite_pragmas(engine)
+
     # Create async session factory
-    async_session_factory = sessionmaker(
+    # (expire_on_commit=False keeps ORM attributes readable after commit
+    # without triggering a refresh SELECT)
+    async_session_factory = async_sessionmaker(
         engine,
-        class_=AsyncSession,
         expire_on_commit=False,
         autoflush=False,
-        autocommit=False,
     )
 
     # Store in app state for dependency injection
@@ -116,6 +285,7 @@ def create_app(instance_path: Path, config: dict) -> FastAPI:
     app.state.async_session_factory = async_session_factory
     app.state.config = config
     app.state.instance_path = instance_path
+    app.state.ready = False  # Set by lifespan once startup has finished
 
     # ==================== WebSocket Configuration ====================
 
@@ -158,7 +328,8 @@ def create_app(instance_path: Path, config: dict) -> FastAPI:
     app.state.code_server_manager = CodeServerManager(
         host=bind_host,
         port=port,
-        code_server_binary=binary
+        code_server_binary=binary,
+        external_host=external_host
     )
 
     # ==================== CORS Configuration ====================
@@ -168,154 +339,61 @@ def create_app(instance_path: Path, config: dict) -> FastAPI:
     if not cors_config:
         raise ValueError("Missing required configuration: [cors]")
 
-    allow_origins = cors_config.get('allow_origins')
-    logger.info(f"Allow origins: {allow_origins}")
-    allow_credentials = cors_config.get('allow_credentials')
-    allow_methods = cors_config.get('allow_methods')
-    allow_headers = cors_config.get('allow_headers')
-
-    if not all([
-        allow_origins is not None,
-        allow_credentials is not None,
-        allow_methods is not None,
-        allow_headers is not None
-    ]):
+    missing = [field for field in CORS_CONFIG_FIELDS if cors_config.get(field) is None]
+    if missing:
         raise ValueError(
-            "Missing required CORS configuration fields: "
-            "allow_origins, allow_credentials, allow_methods, allow_headers"
+            f"Missing required CORS configuration fields: {', '.join(missing)}"
         )
 
+    allow_origins = cors_config['allow_origins']
+    logger.info("Allow origins: %s", allow_origins)
+    allow_credentials = cors_config['allow_credentials']
+    allow_methods = cors_config['allow_methods']
+    allow_headers = cors_config['allow_headers']
+
+    # A literal "*" cannot be sent with credentials, so Starlette mirrors each
+    # request's Origin back instead: every site gets credentialed access
+    if "*" in allow_origins and allow_credentials:
+        logger.warning(
+            "CORS allow_origins contains '*' with allow_credentials=true: "
+            "any origin will be allowed to send credentialed requests"
+        )
+
+    # Pass immutable copies so later edits to the config can't leak into
+    # the middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=allow_origins,
+        allow_origins=tuple(allow_origins),
         allow_credentials=allow_credentials,
-        allow_methods=allow_methods,
-        allow_headers=allow_headers,
+        allow_methods=tuple(allow_methods),
+        allow_headers=tuple(allow_headers),
     )
 
     # ==================== Exception Handlers ====================
 
-    @app.exception_handler(MosaicException)
-    async def mosaic_exception_handler(request: Request, exc: MosaicException) -> JSONResponse:
-        """Handle all Mosaic business exceptions
-
-        All custom exceptions (ValidationError, ConflictError, etc.) inherit from MosaicException.
-        This handler catches them and returns a unified ErrorResponse format.
-
-        Args:
-            request: The incoming request
-            exc: The Mosaic exception instance
-
-        Returns:
-            JSONResponse with ErrorResponse format (HTTP 200, success=false)
-        """
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        # Log business exception
-        logger.warning(
-            f"Business exception in {request.method} {request.url.path}: "
-            f"[{exc.code}] {exc.message}"
-        )
-
-        return JSONResponse(
-            status_code=200,  # Business errors return 200 with success=false
-            content=ErrorResponse(
-                message=exc.message,
-                error={"code": exc.code}
-            ).model_dump()
-        )
-
-    @app.exception_handler(RequestValidationError)
-    async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
-        """Handle Pydantic validation errors
-
-        This catches errors from FastAPI's automatic request validation
-        (e.g., invalid email format, missing required fields, type mismatches).
-
-        Args:
-            request: The incoming request
-            exc: The validation error instance
-
-        Returns:
-            JSONResponse with ErrorResponse format (HTTP 200, success=false)
-        """
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        # Log validation error with error details
-        logger.warning(
-            f"Validation error in {request.method} {request.url.path}: "
-            f"{exc.errors()}"
-        )
-
-        return JSONResponse(
-            status_code=200,  # Validation errors also return 200 with success=false
-            content=ErrorResponse(
-                message="Invalid input format",
-                error={
-                    "code": "VALIDATION_ERROR",
-                    "details": exc.errors()
-                }
-            ).model_dump()
-        )
-
-    @app.exception_handler(Exception)
-    async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
-        """Handle all uncaught exceptions (fallback handler)
-
-        This is the last-resort exception handler that catches any exception
-        not handled by the specific handlers above. It logs the full error
-        details and returns a generic error response to the client.
-
-        Args:
-            request: The incoming request
-            exc: The exception instance
-
-        Returns:
-            JSONResponse with ErrorResponse format (HTTP 200, success=false)
-
-        Note:
-            - Logs full exception details (including traceback) for debugging
-            - Returns generic message to client (don't expose internal details)
-            - This handler is registered AFTER specific handlers so it acts as fallback
-        """
-        import logging
-        import traceback
-
-        logger = logging.getLogger(__name__)
-
-        # Log full error details for debugging (including traceback)
-        logger.error(
-            f"Uncaught exception in {request.method} {request.url.path}: "
-            f"{exc.__class__.__name__}: {str(exc)}\n"
-            f"Traceback:\n{traceback.format_exc()}"
-        )
-
-        # Return generic error to client (don't expose internal details)
-        return JSONResponse(
-            status_code=200,  # Keep consistent with other error responses
-            content=ErrorResponse(
-                message="An unexpected error occurred. Please try again later.",
-                error={"code": "INTERNAL_ERROR"}
-            ).model_dump()
-        )
+    # Specific handlers first; the Exception handler is the fallback
+    app.add_exception_handler(MosaicException, mosaic_exception_handler)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
 
     # ==================== Router Registration ====================
 
-    app.include_router(auth_router, prefix="/api")
-    app.include_router(mosaic_router, prefix="/api")
-    app.include_router(node_router, prefix="/api")
-    app.include_router(connection_router, prefix="/api")
-    app.include_router(subscription_router, prefix="/api")
-    app.include_router(event_router, prefix="/api")
-    app.include_router(session_router, prefix="/api")
-    app.include_router(session_routing_router, prefix="/api")
-    app.include_router(message_router, prefix="/api")
-    app.include_router(image_router, prefix="/api")
-    app.include_router(websocket_router, prefix="/api")
-    app.include_router(programmable_router, prefix="/api")
+    api_routers = (
+        auth_router,
+        mosaic_router,
+        node_router,
+        connection_router,
+        subscription_router,
+        event_router,
+        session_router,
+        session_routing_router,
+        message_router,
+        image_router,
+        websocket_router,
+        programmable_router,
+        health_router,
+    )
+    for api_router in api_routers:
+        app.include_router(api_router, prefix="/api")
 
     return app
@@ -0,0 +1,174 @@
+"""In-process TTL caches for hot, rarely-changing lookups"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from .model.mosaic import Mosaic
+from .model.node import Node
+from .model.user import User
+
+
+class TTLCache:
+    """Bounded in-process cache whose entries expire after a fixed TTL
+
+    Entries are evicted least-recently-used first once maxsize is reached.
+    The cache is local to the process, so callers must invalidate entries
+    on every write that changes the cached data.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a live entry, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insert or replace an entry, evicting the oldest ones if full"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove an entry if present"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._entries.clear()
+
+
+# ==================== Node Cache ====================
+
+# Resolved live nodes keyed by (mosaic_id, node_id)
+_node_cache = TTLCache(maxsize=1024, ttl=60.0)
+
+
+def get_cached_node(mosaic_id: int, node_id: str, user_id: int) -> Optional[Node]:
+    """Get a cached live node owned by the given user
+
+    Args:
+        mosaic_id: Mosaic ID the node belongs to
+        node_id: Node identifier within the mosaic
+        user_id: Requesting user's ID (must own the node)
+
+    Returns:
+        Detached Node copy, or None on cache miss or ownership mismatch
+    """
+    node = _node_cache.get((mosaic_id, node_id))
+    if node is None or node.user_id != user_id:
+        return None
+    return node
+
+
+def cache_node(node: Node) -> None:
+    """Cache a detached copy of a live node loaded from the database
+
+    A copy is stored so the cached object is never bound to (or mutated
+    through) a request-scoped database session.
+    """
+    _node_cache.set((node.mosaic_id, node.node_id), Node(**node.model_dump()))
+
+
+def invalidate_node(mosaic_id: int, node_id: str) -> None:
+    """Drop a node from the cache (call after updating or deleting it)"""
+    _node_cache.pop((mosaic_id, node_id))
+
+
+# ==================== Mosaic Cache ====================
+
+# Resolved live mosaics keyed by mosaic_id; kept short-lived because it only
+# serves to absorb bursts of writes against the same mosaic
+_mosaic_cache = TTLCache(maxsize=1024, ttl=5.0)
+
+
+def get_cached_mosaic(mosaic_id: int, user_id: int) -> Optional[Mosaic]:
+    """Get a cached live mosaic owned by the given user
+
+    Args:
+        mosaic_id: Mosaic ID
+        user_id: Requesting user's ID (must own the mosaic)
+
+    Returns:
+        Detached Mosaic copy, or None on cache miss or ownership mismatch
+    """
+    mosaic = _mosaic_cache.get(mosaic_id)
+    if mosaic is None or mosaic.user_id != user_id:
+        return None
+    return mosaic
+
+
+def cache_mosaic(mosaic: Mosaic) -> None:
+    """Cache a detached copy of a live mosaic loaded from the database"""
+    _mosaic_cache.set(mosaic.id, Mosaic(**mosaic.model_dump()))
+
+
+def invalidate_mosaic(mosaic_id: int) -> None:
+    """Drop a mosaic from the cache (call after updating or deleting it)"""
+    _mosaic_cache.pop(mosaic_id)
+
+
+# ==================== Token Cache ====================
+
+# Users authenticated by a JWT, keyed by a digest of the token (raw tokens are
+# never kept); the TTL bounds how long a disabled user is still accepted
+_token_cache = TTLCache(maxsize=10_000, ttl=30.0)
+
+
+def _token_key(token: str) -> str:
+    """Digest used as the cache key for a token"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def get_cached_token_user(token: str) -> Optional[User]:
+    """Get the user a token was recently verified for
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        Detached User copy, or None on cache miss or if the token has expired
+    """
+    key = _token_key(token)
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+
+    user, expires_at = entry
+    if expires_at is not None and expires_at <= time.time():
+        _token_cache.pop(key)
+        return None
+    return user
+
+
+def cache_token_user(token: str, user: User, expires_at: Optional[float]) -> None:
+    """Cache a detached copy of the user a token was just verified for
+
+    Args:
+        token: Verified JWT token string
+        user: Authenticated user loaded from the database
+        expires_at: Token expiry (exp claim, epoch seconds); the entry is
+            never served past it
+    """
+    _token_cache.set(_token_key(token), (User(**user.model_dump()), expires_at))
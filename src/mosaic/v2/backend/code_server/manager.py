@@ -12,16 +12,38 @@ Key features:
 
 import asyncio
 import logging
+import os
+import signal
 import time
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
-import subprocess
+from urllib.parse import quote
 
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# Readiness polling backoff: first retry after 50 ms, growing 1.6x per
+# attempt up to 500 ms (code-server usually binds within a few hundred ms)
+READY_POLL_INITIAL_DELAY = 0.05
+READY_POLL_MAX_DELAY = 0.5
+READY_POLL_BACKOFF = 1.6
+
+# Liveness checks use a bare TCP connect; every Nth check also hits /healthz
+HEALTH_HTTP_CHECK_INTERVAL = 10
+
+# Seconds between background health checks while running
+HEALTH_MONITOR_INTERVAL = 5
+
+# Output logged by code-server once its HTTP server is bound
+# ("HTTP server listening on http://...")
+READY_LOG_MARKER = b"listening on"
+
+# Bytes read from an output pipe at a time; a line longer than this is
+# logged in pieces
+OUTPUT_READ_SIZE = 64 * 1024
+
 
 class CodeServerManager:
     """Manages a single code-server process for all nodes
@@ -50,13 +72,15 @@ class CodeServerManager:
     def __init__(self,
                  host: str = "127.0.0.1",
                  port: int = 20000,
-                 code_server_binary: str = "code-server"):
+                 code_server_binary: str = "code-server",
+                 external_host: Optional[str] = None):
         """Initialize CodeServerManager
 
         Args:
             host: Host address for binding and health checks (default: "127.0.0.1")
             port: Port number to bind code-server (default: 20000)
             code_server_binary: Path or name of code-server executable (default: "code-server")
+            external_host: Host used in URLs handed to browsers (default: same as host)
 
         Notes:
         - Single port is used for all nodes
@@ -66,16 +90,39 @@ class CodeServerManager:
         self.host = host
         self.port = port
         self.code_server_binary = code_server_binary
+        self.external_host = external_host or host
+
+        # Constant part of workspace URLs (see get_url)
+        self._url_prefix = f"http://{self.external_host}:{port}/?folder="
+
+        # Health check endpoint, polled by _wait_for_ready and _is_healthy
+        self._health_url = f"http://{host}:{port}/healthz"
 
         # Single instance state
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.status: str = "stopped"  # 'stopped', 'starting', 'running', 'error'
         self.started_at: Optional[datetime] = None
 
+        # Tasks draining the process's stdout/stderr pipes (an unread pipe
+        # fills up and blocks code-server on write)
+        self._output_tasks: list[asyncio.Task] = []
+
+        # Set by the output drain when code-server logs that it is listening,
+        # which wakes _wait_for_ready without waiting out its backoff
+        self._listening = asyncio.Event()
+
         # Manager state
         self.running: bool = False
         self.lock: asyncio.Lock = asyncio.Lock()
 
+        # HTTP client for health checks, reused across polls so the
+        # keep-alive connection to code-server is not re-established each time
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._health_check_count: int = 0
+
+        # Background task keeping self.status current (see _monitor_health)
+        self._monitor_task: Optional[asyncio.Task] = None
+
         logger.info(
             f"CodeServerManager initialized: host={host}, "
             f"port={port}, binary={code_server_binary}"
@@ -89,7 +136,7 @@ class CodeServerManager:
         1. Check if already running (idempotent)
         2. Start code-server process without workspace
         3. Wait for process to be ready (health check)
-        4. Update status to 'running'
+        4. Update status to 'running' and start the background health monitor
 
         Notes:
         - This should be called in FastAPI lifespan startup
@@ -106,9 +153,10 @@ class CodeServerManager:
             self.status = "starting"
 
             try:
-                # Start code-server process
+                # Start code-server process and drain its output
                 self.process = await self._start_process()
                 self.started_at = datetime.now()
+                self._start_output_drain()
 
                 # Wait for ready
                 ready = await self._wait_for_ready(timeout=30)
@@ -116,17 +164,15 @@ class CodeServerManager:
                     # Failed to start
                     self.status = "error"
                     if self.process:
-                        self.process.terminate()
-                        try:
-                            self.process.wait(timeout=5)
-                        except subprocess.TimeoutExpired:
-                            self.process.kill()
-                            self.process.wait()
+                        await self._terminate_process()
                         self.process = None
+                    await self._stop_output_drain()
+                    await self._close_http()
                     raise RuntimeError("Code-server failed to start within timeout")
 
                 # Success
                 self.status = "running"
+                self._monitor_task = asyncio.create_task(self._monitor_health())
                 logger.info(
                     f"CodeServerManager started successfully: "
                     f"host={self.host}, port={self.port}, pid={self.process.pid}"
@@ -144,10 +190,11 @@ class CodeServerManager:
 
         Business logic:
         1. Check if running
-        2. Terminate process gracefully (SIGTERM)
-        3. Wait for process to exit (timeout: 5 seconds)
-        4. Force kill if timeout
-        5. Clear state
+        2. Stop the background health monitor
+        3. Terminate process gracefully (SIGTERM)
+        4. Wait for process to exit (timeout: 5 seconds)
+        5. Force kill if timeout
+        6. Clear state
 
         Notes:
         - This should be called in FastAPI lifespan shutdown
@@ -162,22 +209,15 @@ class CodeServerManager:
             self.running = False
             self.status = "stopped"
 
+            if self._monitor_task:
+                self._monitor_task.cancel()
+                await asyncio.gather(self._monitor_task, return_exceptions=True)
+                self._monitor_task = None
+
             if self.process:
                 try:
-                    # Terminate gracefully
-                    self.process.terminate()
                     logger.info(f"Terminating code-server process: pid={self.process.pid}")
-
-                    # Wait for process to exit
-                    try:
-                        self.process.wait(timeout=5)
-                        logger.info("Code-server process terminated gracefully")
-                    except subprocess.TimeoutExpired:
-                        # Force kill if timeout
-                        logger.warning("Code-server did not exit gracefully, force killing")
-                        self.process.kill()
-                        self.process.wait()
-                        logger.info("Code-server process force killed")
+                    await self._terminate_process()
 
                 except Exception as e:
                     logger.error(f"Error stopping code-server process: {e}")
@@ -186,6 +226,10 @@ class CodeServerManager:
                     self.process = None
                     self.started_at = None
 
+            await self._stop_output_drain()
+
+            await self._close_http()
+
             logger.info("CodeServerManager stopped successfully")
 
 
@@ -196,13 +240,14 @@ class CodeServerManager:
             workspace_path: Absolute path to the workspace directory
 
         Returns:
-            URL string with ?folder= parameter
+            URL string with ?folder= parameter (path percent-encoded, so
+            spaces or '%' in the path survive)
 
         Example:
             workspace_path = Path("/home/user/mosaic/users/1/1/5")
-            url = "http://127.0.0.1:20000/?folder=/home/user/mosaic/users/1/1/5"
+            url = "http://192.168.1.8:20000/?folder=/home/user/mosaic/users/1/1/5"
         """
-        return f"http://{self.host}:{self.port}/?folder={workspace_path}"
+        return self._url_prefix + quote(str(workspace_path), safe="/")
 
 
     def get_status(self) -> dict:
@@ -223,16 +268,16 @@ class CodeServerManager:
         }
 
 
-    async def _start_process(self) -> subprocess.Popen:
+    async def _start_process(self) -> asyncio.subprocess.Process:
         """Start code-server subprocess (internal method)
 
         Business logic:
         1. Build command line arguments (no workspace specified)
-        2. Start subprocess with Popen
+        2. Start subprocess with asyncio.create_subprocess_exec
         3. Return process handle
 
         Returns:
-            subprocess.Popen handle
+            asyncio.subprocess.Process handle
 
         Raises:
             OSError: If code-server binary not found or permission denied
@@ -257,10 +302,10 @@ class CodeServerManager:
         logger.info(f"Starting code-server: {' '.join(cmd)}")
 
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 start_new_session=True
             )
             logger.info(f"Code-server process started: pid={process.pid}, port={self.port}")
@@ -274,6 +319,128 @@ class CodeServerManager:
             raise
 
 
+    def _start_output_drain(self) -> None:
+        """Start tasks that read the process's stdout/stderr into the log"""
+        self._listening.clear()
+        self._output_tasks = [
+            asyncio.create_task(self._drain_output(self.process.stdout, "stdout")),
+            asyncio.create_task(self._drain_output(self.process.stderr, "stderr")),
+        ]
+
+
+    async def _stop_output_drain(self) -> None:
+        """Cancel the output drain tasks and wait for them to finish"""
+        for task in self._output_tasks:
+            task.cancel()
+        await asyncio.gather(*self._output_tasks, return_exceptions=True)
+        self._output_tasks = []
+
+
+    async def _drain_output(self, stream: asyncio.StreamReader, name: str) -> None:
+        """Read an output pipe until EOF, logging each line at debug level
+
+        Reads fixed-size chunks and splits lines here instead of iterating
+        the StreamReader, whose line reads raise ValueError on lines over its
+        64 KiB limit; that would end the drain and let the pipe fill up.
+
+        Also sets the listening event when code-server reports that its HTTP
+        server is bound.
+
+        Args:
+            stream: Process stdout or stderr reader
+            name: Stream name used in log lines
+        """
+        pending = b""
+        while chunk := await stream.read(OUTPUT_READ_SIZE):
+            *lines, pending = (pending + chunk).split(b"\n")
+            if len(pending) >= OUTPUT_READ_SIZE:
+                # Over-long line: log what we have rather than buffer it all
+                lines.append(pending)
+                pending = b""
+            for line in lines:
+                self._log_output_line(name, line)
+
+        if pending:
+            self._log_output_line(name, pending)
+
+
+    def _log_output_line(self, name: str, line: bytes) -> None:
+        """Log one line of code-server output, watching for the ready marker
+
+        Args:
+            name: Stream name used in log lines
+            line: Raw output line (without the trailing newline)
+        """
+        if READY_LOG_MARKER in line:
+            self._listening.set()
+        logger.debug("code-server %s: %s", name, line.decode(errors="replace").rstrip())
+
+
+    async def _terminate_process(self) -> None:
+        """Terminate the code-server process without blocking the event loop
+
+        Sends SIGTERM, waits up to 5 seconds for the process to exit, then
+        falls back to SIGKILL. Signals go to the whole process group (the
+        process is started in its own session), so code-server's worker
+        processes are stopped too and don't keep holding the port.
+        """
+        if self.process.returncode is not None:
+            return
+
+        # Terminate gracefully
+        self._signal_process_group(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+            logger.info("Code-server process terminated gracefully")
+        except asyncio.TimeoutError:
+            # Force kill if timeout
+            logger.warning("Code-server did not exit gracefully, force killing")
+            self._signal_process_group(signal.SIGKILL)
+            await self.process.wait()
+            logger.info("Code-server process force killed")
+
+
+    def _signal_process_group(self, sig: signal.Signals) -> None:
+        """Send a signal to code-server's process group
+
+        Args:
+            sig: Signal to send
+
+        Notes:
+        - start_new_session=True makes the process a group leader, so its
+          PID is also the group ID
+        - Falls back to signalling the process alone if the group is gone
+        """
+        try:
+            os.killpg(self.process.pid, sig)
+        except ProcessLookupError:
+            try:
+                self.process.send_signal(sig)
+            except ProcessLookupError:
+                pass
+
+
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Get the shared health check HTTP client, creating it on first use
+
+        Returns:
+            aiohttp.ClientSession with a 2 second total timeout per request
+        """
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=2),
+                connector=aiohttp.TCPConnector(limit=4)
+            )
+        return self._http
+
+
+    async def _close_http(self) -> None:
+        """Close the shared health check HTTP client, if open"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+
     async def _wait_for_ready(self, timeout: int = 30) -> bool:
         """Wait for code-server to be ready (health check loop)
 
@@ -281,8 +448,11 @@ class CodeServerManager:
         1. Record start time
         2. Loop until timeout:
            a. Check if process is still alive
-           b. Attempt HTTP health check
-           c. Sleep 1 second before next attempt
+           b. Probe the port with a TCP connect (skip the HTTP check while
+              nothing is listening yet)
+           c. Attempt HTTP health check
+           d. Sleep with exponential backoff (50 ms growing to 500 ms), cut
+              short as soon as code-server logs that it is listening
         3. Return success or failure
 
         Args:
@@ -292,74 +462,150 @@ class CodeServerManager:
             True if ready, False if timeout or process died
 
         Notes:
-        - Uses aiohttp for async HTTP requests
+        - Uses the shared aiohttp client (one keep-alive connection)
         - Each health check has 2 second timeout
-        - Checks every 1 second
+        - The log line only shortens the wait; readiness is still confirmed
+          over HTTP, so a changed log format just falls back to polling
         """
         start_time = time.time()
-        url = f"http://{self.host}:{self.port}/healthz"
+        delay = READY_POLL_INITIAL_DELAY
 
         logger.info(f"Waiting for code-server to be ready: port={self.port}")
 
         while time.time() - start_time < timeout:
             # Check if process is still alive
-            if self.process and self.process.poll() is not None:
+            if self.process and self.process.returncode is not None:
                 logger.error(f"Process died while waiting for ready: pid={self.process.pid}")
                 return False
 
-            # Attempt health check
-            try:
-                check_timeout = aiohttp.ClientTimeout(total=2)
-                async with aiohttp.ClientSession(timeout=check_timeout) as session:
-                    async with session.get(url) as response:
+            # Attempt health check once the port accepts connections
+            if await self._is_port_open():
+                try:
+                    async with self._get_http().get(self._health_url) as response:
                         if response.status == 200:
                             logger.info(f"Code-server ready: port={self.port}")
                             return True
 
-            except (asyncio.TimeoutError, aiohttp.ClientError):
-                # Expected during startup, continue waiting
-                pass
-            except Exception as e:
-                logger.warning(f"Unexpected error during health check: {e}")
+                except (asyncio.TimeoutError, aiohttp.ClientError):
+                    # Expected during startup, continue waiting
+                    pass
+                except Exception as e:
+                    logger.warning(f"Unexpected error during health check: {e}")
 
-            # Wait before next attempt
-            await asyncio.sleep(1)
+            # Wait before next attempt (woken early once code-server is listening;
+            # after that the event stays set and the loop polls at the backoff)
+            if self._listening.is_set():
+                await asyncio.sleep(delay)
+            else:
+                try:
+                    await asyncio.wait_for(self._listening.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            delay = min(delay * READY_POLL_BACKOFF, READY_POLL_MAX_DELAY)
 
         # Timeout reached
         logger.error(f"Timeout waiting for code-server to be ready: port={self.port}")
         return False
 
 
+    async def _is_port_open(self) -> bool:
+        """Check whether code-server's port accepts TCP connections
+
+        Returns:
+            True if a TCP connection could be opened, False otherwise
+        """
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                timeout=1
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+
+    async def _monitor_health(self) -> None:
+        """Keep self.status current while the manager is running
+
+        Business logic:
+        1. Every HEALTH_MONITOR_INTERVAL seconds, run _is_healthy
+        2. Flip status between 'running' and 'error' on changes
+        3. Stop monitoring once the process has exited
+
+        Notes:
+        - Readers (e.g. the readiness probe) use the cached status and
+          never wait on a health check themselves
+        - Only status transitions are logged
+        """
+        while self.running:
+            await asyncio.sleep(HEALTH_MONITOR_INTERVAL)
+
+            healthy = await self._is_healthy()
+            if not self.running:
+                break
+
+            if healthy:
+                if self.status == "error":
+                    logger.info("Code-server recovered: port=%s", self.port)
+                    self.status = "running"
+                continue
+
+            if self.status == "running":
+                logger.warning("Code-server became unhealthy: port=%s", self.port)
+                self.status = "error"
+
+            if self.process is None or self.process.returncode is not None:
+                logger.error(
+                    "Code-server process exited: returncode=%s",
+                    self.process.returncode if self.process else None
+                )
+                break
+
+
     async def _is_healthy(self) -> bool:
         """Check if instance is healthy (single health check)
 
         Business logic:
         1. Check if process is alive
-        2. Perform HTTP health check
-        3. Return result
+        2. Check that the port accepts TCP connections
+        3. Every HEALTH_HTTP_CHECK_INTERVAL-th call, also perform the HTTP
+           health check
+        4. Return result
 
         Returns:
             True if healthy, False otherwise
 
         Notes:
-        - Quick check with 2 second timeout
-        - Does not modify instance state
+        - TCP probe has a 1 second timeout, HTTP check a 2 second timeout
+        - Does not modify instance state (apart from the check counter)
         """
         # Check if process is still alive
-        if not self.process or self.process.poll() is not None:
+        if not self.process or self.process.returncode is not None:
             logger.warning("Code-server process is not running")
             return False
 
+        # Cheap liveness probe: is the port accepting connections
+        if not await self._is_port_open():
+            logger.warning("Code-server port is not accepting connections")
+            return False
+
+        self._health_check_count += 1
+        if self._health_check_count % HEALTH_HTTP_CHECK_INTERVAL != 0:
+            return True
+
         # Perform HTTP health check
-        url = f"http://{self.host}:{self.port}/healthz"
         try:
-            timeout = aiohttp.ClientTimeout(total=2)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return True
-                    logger.warning(f"Health check failed: status={response.status}")
-                    return False
+            async with self._get_http().get(self._health_url) as response:
+                if response.status == 200:
+                    return True
+                logger.warning(f"Health check failed: status={response.status}")
+                return False
 
         except asyncio.TimeoutError:
             logger.debug("Health check timeout")
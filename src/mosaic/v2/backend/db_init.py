@@ -1,14 +1,85 @@
 """Database initialization and pre-flight checks"""
+import asyncio
 import logging
 from datetime import datetime
-from sqlmodel import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, select, update
+from sqlalchemy import text, event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
 
 from .model.session import Session
 from .enum import SessionStatus
 
 logger = logging.getLogger(__name__)
 
+# Applied to every new SQLite connection:
+# - WAL lets readers run concurrently with the writer
+# - synchronous=NORMAL fsyncs at checkpoints instead of every commit (safe in WAL)
+# - temp tables/indices in memory, 64 MB page cache, 256 MB memory-mapped I/O
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",
+    "mmap_size=268435456",
+)
+
+
+def register_sqlite_pragmas(engine: AsyncEngine) -> None:
+    """
+    Apply SQLITE_PRAGMAS to each connection the engine opens.
+
+    The pragmas are connection-scoped, so they are set from a "connect"
+    listener, which runs once per new DBAPI connection. Pooled connections
+    keep them, so requests never re-run them.
+
+    Args:
+        engine: SQLAlchemy async engine for the SQLite database
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
+
+
+async def ensure_indexes(engine: AsyncEngine) -> None:
+    """
+    Create indexes declared on the models that the database is missing.
+
+    Tables (and their indexes) are only created by `mosaic init`, and
+    create_all skips existing tables together with their indexes, so an
+    index added to a model later would never reach an existing instance.
+    Tables that don't exist yet are skipped; once every index exists this
+    only reads the schema.
+
+    Args:
+        engine: SQLAlchemy async engine for the SQLite database
+    """
+    # Importing .model (done above via .model.session) registers every
+    # table on SQLModel.metadata
+    def _create_missing(sync_conn) -> list[str]:
+        inspector = inspect(sync_conn)
+        existing_tables = set(inspector.get_table_names())
+        created = []
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(sync_conn)
+                    created.append(index.name)
+        return created
+
+    async with engine.begin() as conn:
+        created = await conn.run_sync(_create_missing)
+
+    if created:
+        logger.info("Created missing database indexes: %s", ", ".join(created))
+
 
 async def cleanup_orphaned_sessions(async_session_factory) -> None:
     """
@@ -68,3 +139,27 @@ async def run_preflight_checks(async_session_factory) -> None:
     """
     await cleanup_orphaned_sessions(async_session_factory)
     # Future preflight checks can be added here...
+
+
+async def warm_up_pool(engine: AsyncEngine) -> None:
+    """
+    Open the connection pool's connections before serving requests.
+
+    The async engine opens pooled connections lazily, so without this the
+    first requests after startup each pay the connection setup cost
+    (for aiosqlite: a worker thread plus opening the database file).
+    All connections are checked out at the same time, so the pool has to
+    create distinct ones. They are then returned to the pool, where they
+    stay idle for later requests.
+
+    Args:
+        engine: SQLAlchemy async engine whose pool should be filled
+    """
+    pool_size = engine.pool.size()
+    connections = await asyncio.gather(*(engine.connect() for _ in range(pool_size)))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in connections))
+
+    logger.info(f"Database connection pool warmed up: {pool_size} connections")
@@ -6,9 +6,12 @@ from typing import AsyncGenerator
 from fastapi import Request, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 
 from .security import verify_token_and_get_user
-from .model import User
+from .model import User, Mosaic
+from .cache import get_cached_mosaic, cache_mosaic
+from .exception import NotFoundError, PermissionError
 
 logger = logging.getLogger(__name__)
 
@@ -99,3 +102,65 @@ async def get_current_user(
 
     # Delegate to shared verification function in security module
     return await verify_token_and_get_user(token, jwt_config, session)
+
+
+async def get_owned_mosaic(
+    mosaic_id: int,
+    session: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+) -> Mosaic:
+    """Get the mosaic from the path and verify the current user owns it
+
+    Usage:
+        from typing import Annotated
+        from fastapi import Depends
+
+        OwnedMosaicDep = Annotated[Mosaic, Depends(get_owned_mosaic)]
+
+        @router.post("/mosaics/{mosaic_id}/example")
+        async def example_route(mosaic: OwnedMosaicDep):
+            # mosaic exists, is not deleted and belongs to the current user
+            ...
+
+    Args:
+        mosaic_id: Mosaic ID from the path (injected automatically)
+        session: Database session (injected automatically)
+        current_user: Authenticated user (injected automatically)
+
+    Returns:
+        Mosaic: Live mosaic owned by the current user
+
+    Raises:
+        NotFoundError: If mosaic not found
+        PermissionError: If mosaic doesn't belong to current user
+
+    Note:
+        - FastAPI resolves this once per request, however many times it is declared
+        - Owned mosaics are cached for a few seconds across requests; the mosaic
+          API invalidates the entry on update and delete
+    """
+    mosaic = get_cached_mosaic(mosaic_id, current_user.id)
+    if mosaic:
+        return mosaic
+
+    result = await session.execute(
+        select(Mosaic).where(
+            Mosaic.id == mosaic_id,
+            Mosaic.deleted_at.is_(None)
+        )
+    )
+    mosaic = result.scalar_one_or_none()
+
+    if not mosaic:
+        logger.warning("Mosaic not found: id=%s", mosaic_id)
+        raise NotFoundError("Mosaic not found")
+
+    if mosaic.user_id != current_user.id:
+        logger.warning(
+            "Permission denied: mosaic_id=%s, owner_id=%s, requester_id=%s",
+            mosaic_id, mosaic.user_id, current_user.id
+        )
+        raise PermissionError("You do not have permission to access this mosaic")
+
+    cache_mosaic(mosaic)
+    return mosaic
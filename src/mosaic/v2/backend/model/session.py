@@ -1,5 +1,6 @@
 """Session model for Claude Code conversations"""
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Column, JSON
 from datetime import datetime
 from typing import Optional
@@ -16,6 +17,25 @@ class Session(BaseModel, table=True):
     """
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Matches list_sessions filter + ORDER BY last_activity_at DESC
+        Index(
+            "idx_sessions_list",
+            "mosaic_id",
+            "user_id",
+            "deleted_at",
+            "last_activity_at",
+        ),
+        # Matches status-filtered lookups of live sessions (batch archive)
+        Index(
+            "idx_sessions_active_status",
+            "mosaic_id",
+            "user_id",
+            "status",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     # Unique identifier
     session_id: str = Field(
@@ -29,6 +29,38 @@ class SessionRouting(BaseModel, table=True):
             sqlite_where=text("deleted_at IS NULL"),
             postgresql_where=text("deleted_at IS NULL"),
         ),
+        # Covers the recursive topology CTE and child lookups (local -> remote)
+        Index(
+            "idx_session_routing_tree",
+            "mosaic_id",
+            "local_session_id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Covers list_session_routings keyset pagination (created_at DESC, id DESC);
+        # the trailing projected columns make it a covering index, so the list
+        # is answered from the index alone without visiting table rows
+        Index(
+            "idx_session_routing_list",
+            "mosaic_id",
+            "user_id",
+            "created_at",
+            "id",
+            "local_node_id",
+            "local_session_id",
+            "remote_node_id",
+            "remote_session_id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Covers parent lookups (remote -> local)
+        Index(
+            "idx_session_routing_parent",
+            "mosaic_id",
+            "remote_session_id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
     )
 
     # References
@@ -44,6 +44,16 @@ class Subscription(BaseModel, table=True):
             sqlite_where=text("deleted_at IS NULL"),
             postgresql_where=text("deleted_at IS NULL"),
         ),
+        # Covers list_subscriptions keyset pagination (created_at DESC, id DESC)
+        Index(
+            "idx_subscriptions_list",
+            "mosaic_id",
+            "user_id",
+            "created_at",
+            "id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
     )
 
     # References
@@ -0,0 +1,51 @@
+"""Keyset (cursor) pagination helpers
+
+Cursors encode the sort key of the last returned row, (created_at, id),
+as an opaque URL-safe base64 string. List endpoints ordered by
+created_at DESC, id DESC continue with WHERE (created_at, id) < cursor,
+which stays an index range scan no matter how deep the client pages.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+from .exception import ValidationError
+
+# Deepest OFFSET served by page-number pagination; deeper pages must use a
+# cursor, since OFFSET makes the database walk and discard every skipped row
+MAX_OFFSET = 10_000
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode the sort key of the last returned row into a cursor
+
+    Args:
+        created_at: Creation time of the last row
+        row_id: Primary key of the last row
+
+    Returns:
+        Opaque cursor string for the next page
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor()
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (created_at, row_id) of the last row of the previous page
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValidationError("Invalid pagination cursor")
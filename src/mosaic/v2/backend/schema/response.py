@@ -56,7 +56,19 @@ class PaginatedData(BaseModel, Generic[T]):
     """
 
     items: List[T] = Field(..., description="List of items for current page")
-    total: int = Field(..., description="Total number of items across all pages", ge=0)
+    total: Optional[int] = Field(
+        ...,
+        description="Total number of items across all pages (null when not computed, e.g. cursor pagination)",
+        ge=0
+    )
     page: int = Field(..., description="Current page number", ge=1)
     page_size: int = Field(..., description="Number of items per page", ge=1)
-    total_pages: int = Field(..., description="Total number of pages", ge=0)
+    total_pages: Optional[int] = Field(
+        ...,
+        description="Total number of pages (null when total is not computed)",
+        ge=0
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor for the next page (keyset pagination), null on the last page or if unsupported"
+    )
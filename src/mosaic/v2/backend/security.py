@@ -124,6 +124,22 @@ def decode_access_token(token: str, jwt_config: dict) -> dict[str, Any] | None:
         return None
 
 
+def get_token_expiry(token: str) -> float | None:
+    """Read the exp claim of an already verified token without re-verifying it
+
+    Args:
+        token: JWT token string (must have been verified by decode_access_token)
+
+    Returns:
+        Expiration time in epoch seconds, or None if the token carries none
+    """
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+    return float(exp) if exp is not None else None
+
+
 async def verify_token_and_get_user(token: str, jwt_config: dict, session: AsyncSession):
     """Verify JWT token and retrieve user from database.
 
@@ -17,13 +17,15 @@ Architecture:
     FastAPI Main Thread (Loop A)
         UserMessageBroker._forward_messages(user_id)
             ↓ queue.get()
-            ↓ websocket.send_json(msg)
+            ↓ websocket.send_text(orjson.dumps(msg))
         Browser
 """
 
 import asyncio
 import logging
-from typing import Dict, Optional, Set
+from typing import Any, Dict, Optional, Set
+
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
@@ -127,7 +129,7 @@ class UserMessageBroker:
         """
         # Initialize user's connection set if first connection
         if user_id not in self._user_websockets:
-            logger.debug(f"Initializing connection set for user {user_id}")
+            logger.debug("Initializing connection set for user %s", user_id)
             self._user_websockets[user_id] = set()
             self._user_queues[user_id] = {}
             self._user_tasks[user_id] = {}
@@ -135,7 +137,8 @@ class UserMessageBroker:
         # Check if this WebSocket is already registered
         if websocket in self._user_websockets[user_id]:
             logger.warning(
-                f"User {user_id} WebSocket already registered (ws_id={id(websocket)}), skipping"
+                "User %s WebSocket already registered (ws_id=%s), skipping",
+                user_id, id(websocket)
             )
             return
 
@@ -156,22 +159,24 @@ class UserMessageBroker:
                     exc = t.exception()
                     if exc:
                         logger.error(
-                            f"Forwarding task failed for user {user_id} "
-                            f"(ws_id={id(websocket)}): {exc}",
-                            exc_info=(type(exc), exc, exc.__traceback__)
+                            "Forwarding task failed for user %s "
+                            "(ws_id=%s): %s",
+                            user_id, id(websocket), exc, exc_info=(type(exc), exc, exc.__traceback__)
                         )
             except Exception as e:
                 logger.error(
-                    f"Error in task callback for user {user_id} "
-                    f"(ws_id={id(websocket)}): {e}"
+                    "Error in task callback for user %s "
+                    "(ws_id=%s): %s",
+                    user_id, id(websocket), e
                 )
 
         task.add_done_callback(task_done_callback)
 
         connection_count = len(self._user_websockets[user_id])
         logger.info(
-            f"User {user_id} WebSocket connected (ws_id={id(websocket)}), "
-            f"total_connections={connection_count}"
+            "User %s WebSocket connected (ws_id=%s), "
+            "total_connections=%s",
+            user_id, id(websocket), connection_count
         )
 
     async def disconnect_user(self, user_id: int, websocket: Optional[WebSocket] = None):
@@ -185,20 +190,22 @@ class UserMessageBroker:
                       If provided, only that specific connection will be disconnected.
         """
         if user_id not in self._user_websockets:
-            logger.debug(f"User {user_id} has no connections to disconnect")
+            logger.debug("User %s has no connections to disconnect", user_id)
             return
 
         # If websocket specified, disconnect only that connection
         if websocket is not None:
             if websocket not in self._user_websockets[user_id]:
                 logger.debug(
-                    f"User {user_id} WebSocket not found (ws_id={id(websocket)}), "
-                    f"probably already disconnected"
+                    "User %s WebSocket not found (ws_id=%s), "
+                    "probably already disconnected",
+                    user_id, id(websocket)
                 )
                 return
 
             logger.debug(
-                f"Disconnecting specific WebSocket for user {user_id} (ws_id={id(websocket)})"
+                "Disconnecting specific WebSocket for user %s (ws_id=%s)",
+                user_id, id(websocket)
             )
 
             # Cancel message forwarding task for this connection
@@ -210,15 +217,18 @@ class UserMessageBroker:
                         await asyncio.wait_for(task, timeout=1.0)
                     except asyncio.CancelledError:
                         logger.debug(
-                            f"Forwarding task cancelled for user {user_id} (ws_id={id(websocket)})"
+                            "Forwarding task cancelled for user %s (ws_id=%s)",
+                            user_id, id(websocket)
                         )
                     except asyncio.TimeoutError:
                         logger.warning(
-                            f"Task cancellation timed out for user {user_id} (ws_id={id(websocket)})"
+                            "Task cancellation timed out for user %s (ws_id=%s)",
+                            user_id, id(websocket)
                         )
                     except Exception as e:
                         logger.debug(
-                            f"Task cancellation error for user {user_id} (ws_id={id(websocket)}): {e}"
+                            "Task cancellation error for user %s (ws_id=%s): %s",
+                            user_id, id(websocket), e
                         )
 
                 del self._user_tasks[user_id][websocket]
@@ -228,7 +238,8 @@ class UserMessageBroker:
                 await websocket.close()
             except Exception as e:
                 logger.debug(
-                    f"Error closing WebSocket for user {user_id} (ws_id={id(websocket)}): {e}"
+                    "Error closing WebSocket for user %s (ws_id=%s): %s",
+                    user_id, id(websocket), e
                 )
 
             # Remove from connection set
@@ -242,27 +253,29 @@ class UserMessageBroker:
 
             # Clean up user entry if no more connections
             if remaining_connections == 0:
-                logger.debug(f"User {user_id} has no more connections, cleaning up user entry")
+                logger.debug("User %s has no more connections, cleaning up user entry", user_id)
                 del self._user_websockets[user_id]
                 del self._user_queues[user_id]
                 del self._user_tasks[user_id]
 
             logger.info(
-                f"User {user_id} WebSocket disconnected (ws_id={id(websocket)}), "
-                f"remaining_connections={remaining_connections}"
+                "User %s WebSocket disconnected (ws_id=%s), "
+                "remaining_connections=%s",
+                user_id, id(websocket), remaining_connections
             )
 
         # If no websocket specified, disconnect all connections
         else:
-            logger.debug(f"Disconnecting all WebSockets for user {user_id}")
+            logger.debug("Disconnecting all WebSockets for user %s", user_id)
             websockets = list(self._user_websockets[user_id])
 
             for ws in websockets:
                 await self.disconnect_user(user_id, ws)
 
             logger.info(
-                f"All WebSocket connections disconnected for user {user_id} "
-                f"(count={len(websockets)})"
+                "All WebSocket connections disconnected for user %s "
+                "(count=%s)",
+                user_id, len(websockets)
             )
 
     async def _forward_messages(self, user_id: int, websocket: WebSocket):
@@ -278,13 +291,15 @@ class UserMessageBroker:
         """
         ws_id = id(websocket)
         logger.info(
-            f"Message forwarding task started for user {user_id} (ws_id={ws_id})"
+            "Message forwarding task started for user %s (ws_id=%s)",
+            user_id, ws_id
         )
 
         # Get connection-specific queue (defensive check)
         if user_id not in self._user_queues or websocket not in self._user_queues[user_id]:
             logger.error(
-                f"Queue not found for user {user_id} (ws_id={ws_id}), task exiting"
+                "Queue not found for user %s (ws_id=%s), task exiting",
+                user_id, ws_id
             )
             return
 
@@ -298,40 +313,56 @@ class UserMessageBroker:
 
                     # Double-check connection still exists before sending
                     if user_id in self._user_websockets and websocket in self._user_websockets[user_id]:
-                        await websocket.send_json(message)
+                        # Pre-encoded frames are sent as-is; dicts are encoded
+                        # with orjson instead of stdlib json (send_json), still
+                        # as a text frame
+                        if isinstance(message, str):
+                            await websocket.send_text(message)
+                            logger.debug(
+                                "Sent pre-encoded frame to user %s (ws_id=%s)",
+                                user_id, ws_id
+                            )
+                            continue
+
+                        await websocket.send_text(
+                            orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+                        )
                         logger.debug(
-                            f"Sent to user {user_id} (ws_id={ws_id}): "
-                            f"type={message.get('message_type')}, "
-                            f"session={message.get('session_id')}"
+                            "Sent to user %s (ws_id=%s): type=%s, session=%s",
+                            user_id, ws_id, message.get('message_type'), message.get('session_id')
                         )
                     else:
                         logger.warning(
-                            f"WebSocket for user {user_id} (ws_id={ws_id}) no longer available"
+                            "WebSocket for user %s (ws_id=%s) no longer available",
+                            user_id, ws_id
                         )
                         break
 
                 except asyncio.CancelledError:
                     # Task was cancelled (normal during disconnect)
                     logger.debug(
-                        f"Message forwarding task cancelled for user {user_id} (ws_id={ws_id})"
+                        "Message forwarding task cancelled for user %s (ws_id=%s)",
+                        user_id, ws_id
                     )
                     raise  # Re-raise to properly cancel the task
 
                 except Exception as e:
                     logger.error(
-                        f"Error forwarding message to user {user_id} (ws_id={ws_id}): {e}",
-                        exc_info=True
+                        "Error forwarding message to user %s (ws_id=%s): %s",
+                        user_id, ws_id, e, exc_info=True
                     )
                     break
 
         except asyncio.CancelledError:
             # Task cancellation (normal during disconnect)
             logger.debug(
-                f"Message forwarding task cancelled for user {user_id} (ws_id={ws_id})"
+                "Message forwarding task cancelled for user %s (ws_id=%s)",
+                user_id, ws_id
             )
         finally:
             logger.info(
-                f"Message forwarding task ended for user {user_id} (ws_id={ws_id})"
+                "Message forwarding task ended for user %s (ws_id=%s)",
+                user_id, ws_id
             )
 
     def push_from_worker(self, user_id: int, message: dict):
@@ -354,7 +385,7 @@ class UserMessageBroker:
         """
         # Schedule message delivery in main loop (thread-safe)
         # All checks and dictionary access happen in main thread
-        logger.debug(f"Pushing message to WebSocket: user_id={user_id}, message={message}")
+        logger.debug("Pushing message to WebSocket: user_id=%s, message=%s", user_id, message)
         if self._main_loop:
             self._main_loop.call_soon_threadsafe(
                 self._push_message_internal, user_id, message
@@ -379,7 +410,7 @@ class UserMessageBroker:
         # Get all queues for this user
         user_queues = self._user_queues.get(user_id)
         if not user_queues:
-            logger.debug(f"No WebSocket connections for user {user_id}, message dropped")
+            logger.debug("No WebSocket connections for user %s, message dropped", user_id)
             return
 
         # Broadcast to all connections
@@ -391,21 +422,48 @@ class UserMessageBroker:
                 queue.put_nowait(message)
                 success_count += 1
                 logger.debug(
-                    f"Message queued for user {user_id} (ws_id={id(websocket)}): "
-                    f"type={message.get('message_type')}"
+                    "Message queued for user %s (ws_id=%s): "
+                    "type=%s",
+                    user_id, id(websocket), message.get('message_type')
                 )
             except Exception as e:
                 failed_count += 1
                 logger.error(
-                    f"Failed to queue message for user {user_id} (ws_id={id(websocket)}): {e}"
+                    "Failed to queue message for user %s (ws_id=%s): %s",
+                    user_id, id(websocket), e
                 )
 
         total_connections = len(user_queues)
         logger.debug(
-            f"Message broadcast for user {user_id}: "
-            f"success={success_count}, failed={failed_count}, total={total_connections}"
+            "Message broadcast for user %s: "
+            "success=%s, failed=%s, total=%s",
+            user_id, success_count, failed_count, total_connections
         )
 
+    def send_to_connection(self, user_id: int, websocket: WebSocket, message: Any):
+        """
+        Queue a reply for one specific connection (runs in main loop).
+
+        Used by the WebSocket endpoint for replies to client frames (e.g.,
+        errors). The message goes through the connection's forwarding task,
+        so it keeps its order relative to runtime messages and the socket
+        has a single writer.
+
+        Args:
+            user_id: User database ID
+            websocket: Connection the reply belongs to
+            message: Message dict, or an already JSON-encoded str
+        """
+        queue = self._user_queues.get(user_id, {}).get(websocket)
+        if queue is None:
+            logger.debug(
+                "No queue for user %s (ws_id=%s), reply dropped",
+                user_id, id(websocket)
+            )
+            return
+
+        queue.put_nowait(message)
+
     def is_user_connected(self, user_id: int) -> bool:
         """
         Check if user has any active WebSocket connections.
@@ -429,7 +487,8 @@ class UserMessageBroker:
         total_connections = sum(len(connections) for connections in self._user_websockets.values())
 
         logger.info(
-            f"Disconnecting all users: {len(user_ids)} users, {total_connections} connections"
+            "Disconnecting all users: %s users, %s connections",
+            len(user_ids), total_connections
         )
 
         for user_id in user_ids:
@@ -437,5 +496,6 @@ class UserMessageBroker:
             await self.disconnect_user(user_id)
 
         logger.info(
-            f"Disconnected all users: {len(user_ids)} users, {total_connections} connections"
+            "Disconnected all users: %s users, %s connections",
+            len(user_ids), total_connections
         )
@@ -57,6 +57,7 @@ def init(path: str = None):
     config_content = """[server]
 host = "0.0.0.0"
 port = 18888
+loop = "auto"  # Event loop: "auto" (uvloop if installed), "uvloop" or "asyncio"
 
 [cors]
 allow_origins = ["http://localhost:3000", "http://localhost:3001"]
@@ -64,6 +65,12 @@ allow_credentials = true
 allow_methods = ["*"]
 allow_headers = ["*"]
 
+[database]
+pool_size = 20  # Pooled SQLite connections kept open
+max_overflow = 10  # Extra connections allowed under load
+pool_recycle = 300  # Seconds before a pooled connection is replaced
+busy_timeout = 30  # Seconds a writer waits on a locked database
+
 [jwt]
 secret_key = "your-secret-key-change-this-in-production"
 algorithm = "HS256"
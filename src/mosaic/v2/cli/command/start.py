@@ -91,6 +91,8 @@ def start(path: str = None):
             app,
             host=host,
             port=port,
+            # "auto" uses uvloop when it is installed, else asyncio
+            loop=config['server'].get('loop', 'auto'),
         )
     finally:
         # Clean up PID file when server stops